@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.core.validators import RegexValidator, MinLengthValidator
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class UserManager(BaseUserManager):
@@ -68,8 +69,30 @@ class User(AbstractUser):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = []
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Case-insensitive email lookups (bulk tournament imports and invitations)
+            models.Index(Lower("email"), name="accounts_user_email_lower_idx"),
+        ]
+
     objects = UserManager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_identity = (loaded.get("email"), loaded.get("public_username"))
+        return instance
+
+    @property
+    def search_identity(self):
+        """Fields copied into the search documents of tournaments this user organizes"""
+        return (self.email, self.public_username)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_identity = self.search_identity
+
     def __str__(self) -> str:  # pragma: no cover - trivial representation
         return self.public_username or self.email or "User"
 
@@ -86,6 +86,25 @@ else:
         }
     }
 
+# Shared cache (Redis when configured, per-process memory otherwise).
+# Production needs REDIS_URL: with several workers, the live scoreboard
+# (RedisBroker) and cache invalidation only reach every process through Redis.
+REDIS_URL = config("REDIS_URL", default="")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -156,6 +175,26 @@ EMAIL_BACKEND = config(
 )
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="noreply@oche180.local")
 
+# Tournament player ratings: "elo" or "glicko2"
+TOURNAMENT_RATING_SYSTEM = config("TOURNAMENT_RATING_SYSTEM", default="elo")
+
+# Background tasks (round auto-advance; invitation expiry and leaderboard ranks via celery beat). Without a broker tasks run eagerly in-process;
+# with one, a worker and a single beat scheduler must be running (the "worker" and "beat" services in docker-compose.yml).
+CELERY_BROKER_URL = config("CELERY_BROKER_URL", default=REDIS_URL or "memory://")
+CELERY_TASK_ALWAYS_EAGER = config("CELERY_TASK_ALWAYS_EAGER", default=CELERY_BROKER_URL == "memory://", cast=bool)
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_BEAT_SCHEDULE = {
+    "expire-tournament-invitations": {
+        "task": "tournaments.tasks.expire_invitations",
+        "schedule": config("INVITATION_SWEEP_SECONDS", default=300, cast=int),
+    },
+    "rebuild-leaderboard-ranks": {
+        "task": "tournaments.tasks.rebuild_leaderboard_ranks",
+        "schedule": config("LEADERBOARD_RANK_SECONDS", default=60, cast=int),
+    },
+}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -15,4 +15,10 @@ printf "\nDatabase is up.\n"
 python manage.py migrate --noinput
 python manage.py collectstatic --noinput
 
-gunicorn config.wsgi:application --bind 0.0.0.0:8000
+# Threaded workers: live scoreboard streams (up to 5 min) and match event
+# long-polls hold a thread each, not a whole worker process.
+exec gunicorn config.wsgi:application --bind 0.0.0.0:8000 \
+  --worker-class gthread \
+  --workers "${GUNICORN_WORKERS:-2}" \
+  --threads "${GUNICORN_THREADS:-32}" \
+  --timeout "${GUNICORN_TIMEOUT:-60}"
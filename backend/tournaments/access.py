@@ -0,0 +1,62 @@
+"""Denormalized visibility of private tournaments"""
+from .models import Tournament, TournamentAccess
+
+
+class TournamentAccessIndex:
+    """Keep ``TournamentAccess`` in step with organizers, entries and invitations.
+
+    Only private tournaments have rows, one per (user, reason), so losing
+    one reason (a deleted entry) never hides a tournament the user still
+    organizes or was invited to.
+    """
+
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def visible(user):
+        """Primary keys of every tournament ``user`` may list, as a subquery.
+
+        A UNION of two indexed lookups instead of an OR across joins, so the
+        plan does not degrade as entries grow.
+        """
+        public = Tournament.objects.filter(is_private=False).order_by().values("pk")
+        if user is None:
+            return public
+        return public.union(TournamentAccess.objects.filter(user=user).order_by().values("tournament_id"))
+
+    @staticmethod
+    def private_ids(user):
+        """Primary keys of the private tournaments ``user`` may see"""
+        return list(
+            TournamentAccess.objects.filter(user=user).values_list("tournament_id", flat=True).distinct()
+        )
+
+    @staticmethod
+    def grant(tournament_id, user_ids, source):
+        """Add ``source`` access for ``user_ids`` if the tournament is private"""
+        if user_ids and Tournament.objects.filter(pk=tournament_id, is_private=True).exists():
+            TournamentAccess.objects.bulk_create(
+                [TournamentAccess(user_id=user_id, tournament_id=tournament_id, source=source) for user_id in user_ids],
+                batch_size=TournamentAccessIndex.BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+
+    @staticmethod
+    def revoke(tournament_id, user_id, source):
+        TournamentAccess.objects.filter(tournament_id=tournament_id, user_id=user_id, source=source).delete()
+
+    @staticmethod
+    def rebuild(tournament):
+        """Recompute every row of one tournament (privacy or organizer changed)"""
+        TournamentAccess.objects.filter(tournament_id=tournament.pk).delete()
+        if not tournament.is_private:
+            return
+        Source = TournamentAccess.Source
+        pairs = [(tournament.organizer_id, Source.ORGANIZER)]
+        pairs += [(player_id, Source.ENTRY) for player_id in tournament.entries.values_list("player_id", flat=True)]
+        pairs += [(player_id, Source.INVITATION) for player_id in tournament.invitations.values_list("player_id", flat=True)]
+        TournamentAccess.objects.bulk_create(
+            [TournamentAccess(user_id=user_id, tournament_id=tournament.pk, source=source) for user_id, source in pairs],
+            batch_size=TournamentAccessIndex.BATCH_SIZE,
+            ignore_conflicts=True,
+        )
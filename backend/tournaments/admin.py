@@ -5,6 +5,7 @@ from .models import (
     TournamentEntry,
     TournamentRound,
     TournamentMatch,
+    MatchParticipant,
     TournamentInvitation,
     PlayerTournamentRating,
     TournamentStanding,
@@ -72,6 +73,12 @@ class TournamentMatchAdmin(admin.ModelAdmin):
     list_filter = ("status",)
 
 
+@admin.register(MatchParticipant)
+class MatchParticipantAdmin(admin.ModelAdmin):
+    list_display = ("id", "match", "entry", "placement", "score", "points")
+    search_fields = ("match__tournament__name", "entry__player__email")
+
+
 @admin.register(TournamentInvitation)
 class TournamentInvitationAdmin(admin.ModelAdmin):
     list_display = ("id", "tournament", "player", "status", "invited_by", "created_at", "expires_at")
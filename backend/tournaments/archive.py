@@ -0,0 +1,88 @@
+"""Frozen, pre-rendered documents for completed tournaments"""
+import json
+import zlib
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .bracket_tree import BracketTree
+from .models import Tournament, TournamentArchive, TournamentMatch, TournamentStanding
+from .serializers import TournamentDetailSerializer, TournamentStandingSerializer
+
+
+class TournamentArchiver:
+    """Render a completed tournament once and serve its reads from that document.
+
+    The archive holds the detail, bracket and standings payloads. It is
+    written when a tournament is saved as ``COMPLETED`` and read with a
+    primary-key lookup (no joins), then kept decoded in the cache.
+    """
+
+    # Rendered without a request, so file URLs are stored site-relative
+    URL_FIELDS = ("banner_image",)
+
+    CACHE_KEY = "tournament:{tournament_id}:archive"
+    CACHE_TIMEOUT = 24 * 60 * 60
+    COMPRESSION_LEVEL = 9
+
+    @staticmethod
+    def build(tournament):
+        """Render every archived section (one-off cost, prefetched)"""
+        tournament = Tournament.objects.select_related("organizer").prefetch_related(
+            "entries__player",
+            Prefetch(
+                "rounds__matches",
+                queryset=TournamentMatch.objects.select_related(
+                    "round", "player1_entry__player", "player2_entry__player", "winner_entry__player"
+                ),
+            ),
+        ).get(pk=tournament.pk)
+        standings = TournamentStanding.objects.filter(tournament=tournament).select_related("entry__player")
+        return {
+            "archived_at": timezone.now().isoformat(),
+            "detail": TournamentDetailSerializer(tournament).data,
+            "bracket": BracketTree.build(tournament),
+            "standings": TournamentStandingSerializer(standings, many=True).data,
+        }
+
+    @staticmethod
+    def archive(tournament):
+        """(Re)write the archive; returns its compressed size in bytes"""
+        payload = json.dumps(TournamentArchiver.build(tournament), cls=DjangoJSONEncoder, separators=(",", ":"))
+        document = zlib.compress(payload.encode(), TournamentArchiver.COMPRESSION_LEVEL)
+        TournamentArchive.objects.update_or_create(tournament_id=tournament.pk, defaults={"document": document})
+        cache.delete(TournamentArchiver.CACHE_KEY.format(tournament_id=tournament.pk))
+        return len(document)
+
+    @staticmethod
+    def refresh(tournament):
+        """Rewrite the archive after commit when a result changes in an already completed tournament"""
+        if tournament.status == Tournament.Status.COMPLETED:
+            transaction.on_commit(lambda: TournamentArchiver.archive(tournament))
+
+    @staticmethod
+    def load(tournament):
+        """The archived document of a completed tournament, or ``None``"""
+        if tournament.status != Tournament.Status.COMPLETED:
+            return None
+        key = TournamentArchiver.CACHE_KEY.format(tournament_id=tournament.pk)
+        document = cache.get(key)
+        if document is None:
+            blob = TournamentArchive.objects.filter(pk=tournament.pk).values_list("document", flat=True).first()
+            if blob is None:
+                return None
+            document = json.loads(zlib.decompress(bytes(blob)))
+            cache.set(key, document, TournamentArchiver.CACHE_TIMEOUT)
+        return document
+
+    @staticmethod
+    def detail(document, request):
+        """The archived detail payload with absolute file URLs, as the live serializer renders them"""
+        detail = dict(document["detail"])
+        for field in TournamentArchiver.URL_FIELDS:
+            if detail.get(field):
+                detail[field] = request.build_absolute_uri(detail[field])
+        return detail
@@ -2,8 +2,14 @@
 import math
 import random
 from django.utils import timezone
-from django.db.models import Q
-from .models import TournamentRound, TournamentMatch, TournamentEntry, TournamentStanding
+from django.db import transaction
+from django.db.models import F, Q
+from .caching import bump_bracket_version
+from .models import Tournament, TournamentRound, TournamentMatch, TournamentEntry, TournamentStanding
+from .ladder import LadderEngine
+from .ratings import RatingEngine
+from .scheduler import MatchScheduler
+from .tiebreaks import TiebreakEngine
 
 
 class BracketGenerator:
@@ -80,13 +86,18 @@ class BracketGenerator:
                     match_number=i + 1
                 )
                 
-                # Link previous matches
-                prev_matches[i * 2].next_match = next_match
-                prev_matches[i * 2].save()
+                # Link previous matches, recording which slot each winner takes
+                for slot, prev_match in enumerate(prev_matches[i * 2:i * 2 + 2], start=1):
+                    prev_match.next_match = next_match
+                    prev_match.next_match_slot = slot
+                    prev_match.save(update_fields=["next_match", "next_match_slot"])
+                    
+                    # Byes are decided already, so seed their winners forward
+                    if prev_match.status == TournamentMatch.Status.WALKOVER and prev_match.winner_entry_id:
+                        setattr(next_match, f"player{slot}_entry_id", prev_match.winner_entry_id)
                 
-                if i * 2 + 1 < len(prev_matches):
-                    prev_matches[i * 2 + 1].next_match = next_match
-                    prev_matches[i * 2 + 1].save()
+                if next_match.player1_entry_id or next_match.player2_entry_id:
+                    next_match.save(update_fields=["player1_entry", "player2_entry"])
         
         return True
     
@@ -118,47 +129,81 @@ class BracketGenerator:
     
     @staticmethod
     def generate_round_robin(tournament):
-        """Generate round-robin (everyone plays everyone)"""
-        entries = list(tournament.entries.filter(status=TournamentEntry.Status.CONFIRMED).order_by("seed_number", "registered_at"))
+        """Generate round-robin (everyone plays everyone, twice for a double round robin).
+        
+        The schedule is computed in memory with the circle method, then the
+        rounds and the matches are written with one ``bulk_create`` each. In a
+        double round robin the second cycle repeats the first with player1 and
+        player2 swapped, so each pair meets once in each position.
+        
+        The number of INSERTs is rows / batch size, where the backend caps the
+        batch by its bound-parameter limit (``connection.ops.bulk_batch_size``):
+        about 58 matches per statement on SQLite's 999 parameters, so 64
+        players take some 35 match INSERTs, while PostgreSQL fits the
+        ``batch_size`` of 1000.
+        """
+        entries = list(
+            tournament.entries.filter(status=TournamentEntry.Status.CONFIRMED)
+            .order_by("seed_number", "registered_at")
+            .values_list("pk", flat=True)
+        )
         num_players = len(entries)
         
         if num_players < 2:
             return False
         
-        # Calculate total rounds (n-1 for even, n for odd)
-        num_rounds = num_players if num_players % 2 == 1 else num_players - 1
-        
-        # Add dummy player for odd number
+        # Dummy player for an odd field: whoever meets it sits the round out
         if num_players % 2 == 1:
-            entries.append(None)  # Bye round
-        
-        # Create rounds and matches using round-robin algorithm
-        for round_num in range(num_rounds):
-            round_obj = TournamentRound.objects.create(
-                tournament=tournament,
-                round_number=round_num + 1,
-                name=f"Round {round_num + 1}"
-            )
-            
-            # Create matches for this round
-            for i in range(len(entries) // 2):
-                player1 = entries[i]
-                player2 = entries[len(entries) - 1 - i]
-                
-                if player1 and player2:  # Skip if bye
-                    TournamentMatch.objects.create(
-                        tournament=tournament,
-                        round=round_obj,
+            entries.append(None)
+        
+        cycle = BracketGenerator._circle_pairings(len(entries))
+        schedule = list(cycle)
+        if tournament.round_robin_cycles == 2:
+            schedule += [[(b, a) for a, b in pairs] for pairs in cycle]
+        
+        with transaction.atomic():
+            rounds = TournamentRound.objects.bulk_create([
+                TournamentRound(tournament=tournament, round_number=i + 1, name=f"Round {i + 1}")
+                for i in range(len(schedule))
+            ])
+            matches = []
+            for round_obj, pairs in zip(rounds, schedule):
+                pairs = [(entries[a], entries[b]) for a, b in pairs if entries[a] and entries[b]]
+                matches += [
+                    TournamentMatch(
+                        tournament_id=tournament.pk,
+                        round_id=round_obj.pk,
                         match_number=i + 1,
-                        player1_entry=player1,
-                        player2_entry=player2
+                        player1_entry_id=player1,
+                        player2_entry_id=player2,
                     )
-            
-            # Rotate players (keep first fixed)
-            entries = [entries[0]] + [entries[-1]] + entries[1:-1]
+                    for i, (player1, player2) in enumerate(pairs)
+                ]
+            TournamentMatch.objects.bulk_create(matches, batch_size=1000)
+            # Bulk inserts skip the post_save receivers that invalidate the bracket
+            bump_bracket_version(tournament.pk)
         
         return True
     
+    @staticmethod
+    def _circle_pairings(num_players):
+        """Circle-method rounds of (player1, player2) index pairs for an even field.
+        
+        The last index stays fixed while the others rotate; in round ``r`` it
+        meets ``r`` and everyone else is paired symmetrically around ``r``.
+        Alternating sides by round (fixed player) and by distance (the rest)
+        gives every player ``(n - 1) // 2`` or ``n // 2`` matches as player1.
+        """
+        rotating = num_players - 1
+        schedule = []
+        for r in range(rotating):
+            pairs = [(r, rotating) if r % 2 == 0 else (rotating, r)]
+            for k in range(1, num_players // 2):
+                a, b = (r + k) % rotating, (r - k) % rotating
+                pairs.append((a, b) if k % 2 == 1 else (b, a))
+            schedule.append(pairs)
+        return schedule
+    
     @staticmethod
     def _get_round_names(num_rounds):
         """Get descriptive names for rounds"""
@@ -331,94 +376,65 @@ class BracketGenerator:
     @staticmethod
     def update_swiss_standings(tournament):
         """Update standings after matches complete (including tiebreak scores)"""
-        standings = TournamentStanding.objects.filter(tournament=tournament)
-        
-        for standing in standings:
-            # Update basic stats from matches
-            matches = TournamentMatch.objects.filter(
-                tournament=tournament,
-                status=TournamentMatch.Status.COMPLETED
-            ).filter(
-                Q(player1_entry=standing.entry) | Q(player2_entry=standing.entry)
-            )
-            
-            standing.matches_played = matches.count()
-            standing.matches_won = matches.filter(winner_entry=standing.entry).count()
-            standing.matches_lost = matches.exclude(
-                Q(winner_entry=standing.entry) | Q(winner_entry=None)
-            ).count()
-            standing.matches_drawn = matches.filter(winner_entry=None).count()
-            
-            # Calculate tournament points (3 for win, 1 for draw)
-            standing.tournament_points = (standing.matches_won * 3) + standing.matches_drawn
-            
-            # Calculate scores
-            for match in matches:
-                if match.player1_entry == standing.entry:
-                    standing.points_for += match.player1_score
-                    standing.points_against += match.player2_score
-                    if match.player1_score > standing.highest_score:
-                        standing.highest_score = match.player1_score
-                else:
-                    standing.points_for += match.player2_score
-                    standing.points_against += match.player1_score
-                    if match.player2_score > standing.highest_score:
-                        standing.highest_score = match.player2_score
-            
-            standing.update_statistics()
-            standing.calculate_buchholz()
-            standing.calculate_sonneborn_berger()
-            standing.save()
-        
-        # Update ranks
-        ranked_standings = TournamentStanding.objects.filter(
-            tournament=tournament
-        ).order_by(
-            '-tournament_points',
-            '-points_difference',
-            '-buchholz_score',
-            '-sonneborn_berger',
-            '-points_for'
-        )
-        
-        for rank, standing in enumerate(ranked_standings, start=1):
-            standing.rank = rank
-            standing.save()
-        
+        TiebreakEngine.apply(tournament)
         return True
     
     @staticmethod
-    def advance_winner(match, winner_entry):
-        """Advance winner to next match"""
-        match.winner_entry = winner_entry
-        match.status = TournamentMatch.Status.COMPLETED
-        match.completed_at = timezone.now()
-        match.save()
-        
-        # Update entry stats
-        if match.player1_entry:
-            if winner_entry == match.player1_entry:
-                match.player1_entry.wins += 1
-            else:
-                match.player1_entry.losses += 1
-            match.player1_entry.save()
-        
-        if match.player2_entry:
-            if winner_entry == match.player2_entry:
-                match.player2_entry.wins += 1
-            else:
-                match.player2_entry.losses += 1
-            match.player2_entry.save()
-        
-        # Advance to next match if exists
-        if match.next_match:
-            next_match = match.next_match
+    def advance_winner(match, winner_entry, reschedule=True):
+        """Record the result and move the winner into their slot of the next match.
+        
+        The destination slot is fixed at generation time (``next_match_slot``),
+        the next match row is locked with ``select_for_update`` and win/loss
+        counters use ``F()`` increments, so two results reported at the same
+        moment cannot overwrite each other. The match row is locked too: a
+        result reported again leaves the counters alone, and a changed winner
+        (``override_result``) swaps the old win and loss. Each call is a fixed
+        number of statements regardless of bracket size. Pass
+        ``reschedule=False`` when the caller reschedules once after a batch of
+        results.
+        """
+        if winner_entry.pk == match.player1_entry_id:
+            loser_id = match.player2_entry_id
+        else:
+            loser_id = match.player1_entry_id
+        
+        with transaction.atomic():
+            # The stored result, under a row lock, decides what the counters still need
+            previous_winner_id = (
+                TournamentMatch.objects.select_for_update()
+                .filter(pk=match.pk, status=TournamentMatch.Status.COMPLETED)
+                .values_list("winner_entry_id", flat=True)
+                .first()
+            )
+            match.winner_entry = winner_entry
+            match.status = TournamentMatch.Status.COMPLETED
+            match.completed_at = timezone.now()
+            match.save(update_fields=["winner_entry", "status", "completed_at", "player1_score", "player2_score"])
             
-            # Determine which position in next match
-            prev_matches = list(next_match.previous_matches.all().order_by("match_number"))
-            if prev_matches[0] == match:
-                next_match.player1_entry = winner_entry
-            else:
-                next_match.player2_entry = winner_entry
+            # Update entry stats; a repeated report counts nothing, an override takes back the old result
+            if previous_winner_id != winner_entry.pk:
+                winner_update = {"wins": F("wins") + 1}
+                loser_update = {"losses": F("losses") + 1}
+                if previous_winner_id is not None:
+                    winner_update["losses"] = F("losses") - 1
+                    loser_update["wins"] = F("wins") - 1
+                TournamentEntry.objects.filter(pk=winner_entry.pk).update(**winner_update)
+                if loser_id:
+                    TournamentEntry.objects.filter(pk=loser_id).update(**loser_update)
+            
+            RatingEngine.apply_match(match, previous_winner_id)
+            
+            # Ladder challenges move rungs instead of feeding a next match
+            if match.tournament.tournament_format == Tournament.Format.LADDER:
+                LadderEngine.resolve_challenge(match, winner_entry)
             
-            next_match.save()
+            # Advance to next match if exists
+            if match.next_match_id:
+                next_match = TournamentMatch.objects.select_for_update().get(pk=match.next_match_id)
+                slot_field = "player2_entry" if match.next_match_slot == 2 else "player1_entry"
+                setattr(next_match, slot_field, winner_entry)
+                next_match.save(update_fields=[slot_field])
+        
+        # An early or late result shifts everything still waiting for a board
+        if reschedule and match.tournament.auto_schedule:
+            MatchScheduler.schedule(match.tournament)
@@ -0,0 +1,91 @@
+"""Compact bracket document built from a single joined query"""
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .caching import get_bracket_version
+from .models import TournamentMatch
+
+
+class BracketTree:
+    """Build and cache the bracket tree served to spectators"""
+
+    CACHE_TIMEOUT = 60 * 60
+    CACHE_KEY = "tournament:{tournament_id}:bracket:{version}"
+
+    @staticmethod
+    def build(tournament):
+        """Rounds with their matches (ids, names, slots, scores, status)"""
+        rows = TournamentMatch.objects.filter(tournament=tournament).order_by(
+            "round__is_losers_bracket", "round__round_number", "match_number"
+        ).values_list(
+            "id",
+            "round_id",
+            "round__round_number",
+            "round__name",
+            "round__is_losers_bracket",
+            "match_number",
+            "status",
+            "player1_entry_id",
+            "player1_entry__player__email",
+            "player1_score",
+            "player2_entry_id",
+            "player2_entry__player__email",
+            "player2_score",
+            "winner_entry_id",
+            "next_match_id",
+            "next_match_slot",
+            "board_number",
+            "scheduled_time",
+        )
+
+        rounds = []
+        current = None
+        for (match_id, round_id, round_number, round_name, is_losers, match_number, match_status,
+             p1_id, p1_name, p1_score, p2_id, p2_name, p2_score, winner_id,
+             next_id, next_slot, board, scheduled_time) in rows:
+            if current is None or current["id"] != round_id:
+                current = {
+                    "id": round_id,
+                    "number": round_number,
+                    "name": round_name,
+                    "losers": is_losers,
+                    "matches": [],
+                }
+                rounds.append(current)
+            current["matches"].append({
+                "id": match_id,
+                "number": match_number,
+                "status": match_status,
+                "slots": [
+                    {"entry": p1_id, "name": p1_name, "score": p1_score},
+                    {"entry": p2_id, "name": p2_name, "score": p2_score},
+                ],
+                "winner": winner_id,
+                "next": next_id,
+                "next_slot": next_slot,
+                "board": board,
+                "scheduled_time": scheduled_time,
+            })
+
+        return {
+            "tournament": tournament.pk,
+            "format": tournament.tournament_format,
+            "status": tournament.status,
+            "current_round": tournament.current_round,
+            "rounds": rounds,
+        }
+
+    @staticmethod
+    def render(tournament):
+        """Serialized bracket bytes and their version, served from cache when current"""
+        version = get_bracket_version(tournament.pk)
+        key = BracketTree.CACHE_KEY.format(tournament_id=tournament.pk, version=version)
+        body = cache.get(key)
+        if body is None:
+            body = json.dumps(
+                BracketTree.build(tournament), cls=DjangoJSONEncoder, separators=(",", ":")
+            ).encode()
+            cache.set(key, body, BracketTree.CACHE_TIMEOUT)
+        return body, version
@@ -0,0 +1,84 @@
+"""Version counters and cache keys for cached tournament reads"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+BRACKET_VERSION_KEY = "tournament:{tournament_id}:bracket-version"
+LEADERBOARD_VERSION_KEY = "ratings:leaderboard-version"
+TOURNAMENT_LIST_VERSION_KEY = "tournaments:list-version"
+MATCH_EVENT_KEY = "match:{match_id}:last-event"
+LIVE_SEQUENCE_KEY = "tournament:{tournament_id}:live-seq"
+
+
+def _get_version(key):
+    """Missing counters are seeded from the clock, so a counter that was evicted
+    from the cache never falls back to a number used by an older document.
+    """
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def _bump_version(key):
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def get_bracket_version(tournament_id):
+    """Current bracket version for a tournament"""
+    return _get_version(BRACKET_VERSION_KEY.format(tournament_id=tournament_id))
+
+
+def bump_bracket_version(tournament_id):
+    """Invalidate cached bracket documents once the current transaction commits"""
+    _bump_version(BRACKET_VERSION_KEY.format(tournament_id=tournament_id))
+
+
+def get_leaderboard_version():
+    """Current version of the global rating leaderboard"""
+    return _get_version(LEADERBOARD_VERSION_KEY)
+
+
+def bump_leaderboard_version():
+    """Invalidate cached leaderboard pages once the current transaction commits"""
+    _bump_version(LEADERBOARD_VERSION_KEY)
+
+
+def get_list_version():
+    """Current version of every cached tournament list response"""
+    return _get_version(TOURNAMENT_LIST_VERSION_KEY)
+
+
+def bump_list_version():
+    """Invalidate cached tournament list responses once the current transaction commits"""
+    _bump_version(TOURNAMENT_LIST_VERSION_KEY)
+
+
+def get_last_match_event(match_id):
+    """Id of the newest published event for a match, or ``None`` if unknown"""
+    return cache.get(MATCH_EVENT_KEY.format(match_id=match_id))
+
+
+def publish_match_event(match_id, event_id):
+    """Announce a new match event to long-polling readers once it is committed"""
+    key = MATCH_EVENT_KEY.format(match_id=match_id)
+    transaction.on_commit(lambda: cache.set(key, event_id, timeout=None))
+
+
+def next_live_sequence(tournament_id):
+    """Next id for the tournament's live stream (clock-seeded like the versions)"""
+    key = LIVE_SEQUENCE_KEY.format(tournament_id=tournament_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+        return cache.incr(key)
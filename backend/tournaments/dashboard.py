@@ -0,0 +1,93 @@
+"""Organizer dashboard: pending work across every tournament a user runs"""
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import MatchScoreSubmission, Tournament, TournamentEntry, TournamentMatch
+
+
+class OrganizerDashboard:
+    """Per-tournament work counters and the queue of submissions to review.
+
+    Each counter is a correlated ``COUNT`` subquery grouped on the
+    tournament, so the whole summary is one SQL statement however many
+    tournaments the organizer runs, and no rows are multiplied by joining
+    matches, submissions and entries together.
+    """
+
+    COUNTERS = {
+        "pending_submissions": (
+            MatchScoreSubmission.objects.filter(status=MatchScoreSubmission.Status.PENDING),
+            "match__tournament",
+        ),
+        "disputed_submissions": (
+            MatchScoreSubmission.objects.filter(status=MatchScoreSubmission.Status.DISPUTED),
+            "match__tournament",
+        ),
+        "unscheduled_matches": (
+            TournamentMatch.objects.filter(status=TournamentMatch.Status.SCHEDULED, scheduled_time__isnull=True),
+            "tournament",
+        ),
+        "in_progress_matches": (
+            TournamentMatch.objects.filter(status=TournamentMatch.Status.IN_PROGRESS),
+            "tournament",
+        ),
+        "pending_entries": (
+            TournamentEntry.objects.filter(status=TournamentEntry.Status.PENDING),
+            "tournament",
+        ),
+    }
+
+    REVIEW_STATUSES = [MatchScoreSubmission.Status.PENDING, MatchScoreSubmission.Status.DISPUTED]
+
+    # Relations read by ``MatchScoreSubmissionSerializer``, including the nested match details
+    SUBMISSION_RELATED = [
+        "submitted_by",
+        "verified_by",
+        "match__round",
+        "match__player1_entry__player",
+        "match__player2_entry__player",
+        "match__winner_entry__player",
+    ]
+
+    @staticmethod
+    def _count(queryset, field):
+        grouped = (
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(grouped, output_field=IntegerField()), Value(0))
+
+    @staticmethod
+    def summary(user):
+        """One row of counters per tournament organized by ``user`` (one query)"""
+        annotations = {
+            name: OrganizerDashboard._count(queryset, field)
+            for name, (queryset, field) in OrganizerDashboard.COUNTERS.items()
+        }
+        rows = list(
+            Tournament.objects.filter(organizer=user)
+            .order_by("-start_time", "-pk")
+            .values("id", "name", "status", "current_round", "start_time")
+            .annotate(**annotations)
+        )
+        totals = {name: sum(row[name] for row in rows) for name in OrganizerDashboard.COUNTERS}
+        return {"tournaments": rows, "totals": totals}
+
+    @staticmethod
+    def review_queue(user):
+        """Pending and disputed submissions of the organizer's tournaments, oldest first.
+
+        Everything ``MatchScoreSubmissionSerializer`` reads is joined in, so
+        a page is a single query.
+        """
+        return (
+            MatchScoreSubmission.objects.filter(
+                match__tournament__organizer=user, status__in=OrganizerDashboard.REVIEW_STATUSES
+            )
+            .select_related(*OrganizerDashboard.SUBMISSION_RELATED)
+            .order_by("submitted_at", "pk")
+        )
+
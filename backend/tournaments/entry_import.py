@@ -0,0 +1,116 @@
+"""Bulk player import for tournaments (ID lists, email lists and CSV rosters)"""
+import csv
+import io
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .access import TournamentAccessIndex
+from .caching import bump_bracket_version, bump_list_version
+from .models import Tournament, TournamentAccess, TournamentEntry
+
+User = get_user_model()
+
+
+class EntryImporter:
+    """Add many players to a tournament with a fixed number of queries per chunk"""
+
+    CHUNK_SIZE = 500
+
+    @staticmethod
+    def parse_csv(text):
+        """Split CSV cells into player IDs and emails; anything else (headers) is ignored"""
+        player_ids, emails = [], []
+        for row in csv.reader(io.StringIO(text)):
+            for cell in row:
+                value = cell.strip()
+                if value.isdigit():
+                    player_ids.append(int(value))
+                elif "@" in value:
+                    emails.append(value.lower())
+        return player_ids, emails
+
+    @staticmethod
+    def import_players(tournament, player_ids=(), emails=(), auto_approve=False):
+        """Create entries for the given players.
+
+        Returns the player IDs that were ``added``, already registered
+        (``duplicates``) or did not fit (``over_capacity``), the IDs and emails
+        that matched no user (``missing``) and an ``email_of`` lookup for the
+        players that were found.
+        """
+        result = {"added": [], "duplicates": [], "missing": [], "over_capacity": [], "email_of": {}}
+
+        player_ids = list(dict.fromkeys(player_ids))
+        emails = list(dict.fromkeys(email.lower() for email in emails))
+        for start in range(0, len(player_ids), EntryImporter.CHUNK_SIZE):
+            EntryImporter._import_chunk(tournament, "id", player_ids[start:start + EntryImporter.CHUNK_SIZE], auto_approve, result)
+        for start in range(0, len(emails), EntryImporter.CHUNK_SIZE):
+            EntryImporter._import_chunk(tournament, "email", emails[start:start + EntryImporter.CHUNK_SIZE], auto_approve, result)
+
+        if result["added"]:
+            bump_bracket_version(tournament.pk)
+            bump_list_version()
+        return result
+
+    @staticmethod
+    def find_players(lookup, keys):
+        """``{key: (user_id, email)}`` for players matched by ``"id"`` or, case-insensitively, ``"email"``.
+        
+        Email keys must already be lowercase; they are compared with
+        ``LOWER(email)``, which has its own index.
+        """
+        users = User.objects.annotate(key=Lower("email") if lookup == "email" else F("id"))
+        return {key: (user_id, email) for user_id, email, key in users.filter(key__in=keys).values_list("id", "email", "key")}
+
+    @staticmethod
+    def _import_chunk(tournament, lookup, keys, auto_approve, result):
+        with transaction.atomic():
+            # Serialize with registrations and other imports so counts stay exact
+            locked = Tournament.objects.select_for_update().only("confirmed_count", "max_participants").get(pk=tournament.pk)
+
+            found = EntryImporter.find_players(lookup, keys)
+            result["missing"].extend(key for key in keys if key not in found)
+
+            candidates = [found[key][0] for key in keys if key in found]
+            existing = set(
+                TournamentEntry.objects.filter(tournament_id=tournament.pk, player_id__in=candidates)
+                .values_list("player_id", flat=True)
+            )
+            result["duplicates"].extend(player_id for player_id in candidates if player_id in existing)
+            new_ids = [player_id for player_id in candidates if player_id not in existing]
+
+            if auto_approve:
+                free = max(0, locked.max_participants - locked.confirmed_count)
+                result["over_capacity"].extend(new_ids[free:])
+                new_ids = new_ids[:free]
+                status, approved_at = TournamentEntry.Status.CONFIRMED, timezone.now()
+            else:
+                status, approved_at = TournamentEntry.Status.PENDING, None
+
+            TournamentEntry.objects.bulk_create(
+                [
+                    TournamentEntry(tournament_id=tournament.pk, player_id=player_id, status=status, approved_at=approved_at)
+                    for player_id in new_ids
+                ],
+                batch_size=EntryImporter.CHUNK_SIZE,
+                ignore_conflicts=True,
+            )
+            if new_ids:
+                # ignore_conflicts drops rows a concurrent registration inserted first; keep only ours
+                # (a confirmed chunk is told apart by its own approved_at)
+                inserted = set(
+                    TournamentEntry.objects.filter(
+                        tournament_id=tournament.pk, player_id__in=new_ids, status=status, approved_at=approved_at
+                    ).values_list("player_id", flat=True)
+                )
+                result["duplicates"].extend(player_id for player_id in new_ids if player_id not in inserted)
+                new_ids = [player_id for player_id in new_ids if player_id in inserted]
+            if auto_approve and new_ids:
+                Tournament.reserve_spots(tournament.pk, len(new_ids))
+            TournamentAccessIndex.grant(tournament.pk, new_ids, TournamentAccess.Source.ENTRY)
+            result["added"].extend(new_ids)
+            result["email_of"].update({user_id: email for user_id, email in found.values()})
@@ -0,0 +1,53 @@
+"""Incremental match event feed with cursor reads and long-polling"""
+import time
+
+from .caching import get_last_match_event
+from .models import MatchEvent
+
+
+class MatchEventFeed:
+    """Read a match's play-by-play after an event id cursor.
+
+    Reads are an index range scan on ``(match, id)``. Long-poll readers wait
+    on the match's "last event" cache key and only touch the database when
+    it moves past their cursor (or, if the key is unknown to this cache,
+    every ``DB_RECHECK`` seconds).
+
+    A waiting request holds a server thread for up to ``MAX_WAIT`` seconds,
+    so deployments run threaded workers (see ``entrypoint.sh``); clients
+    simply re-issue the request with their cursor when it returns empty.
+    """
+
+    PAGE_SIZE = 200
+    MAX_WAIT = 10
+    POLL_INTERVAL = 0.5
+    DB_RECHECK = 5
+
+    @staticmethod
+    def serialize(event):
+        return {"id": event.pk, "type": event.event_type, "payload": event.payload, "at": event.created_at.isoformat()}
+
+    @staticmethod
+    def fetch(match_id, since_id=0, limit=PAGE_SIZE):
+        """Up to ``limit`` events newer than ``since_id``, oldest first"""
+        events = MatchEvent.objects.filter(match_id=match_id, id__gt=since_id).order_by("id")[:limit]
+        return [MatchEventFeed.serialize(event) for event in events]
+
+    @staticmethod
+    def wait(match_id, since_id=0, timeout=MAX_WAIT):
+        """Like ``fetch`` but blocks up to ``timeout`` seconds for a new event"""
+        events = MatchEventFeed.fetch(match_id, since_id)
+        deadline = time.monotonic() + min(timeout, MatchEventFeed.MAX_WAIT)
+        next_db_check = time.monotonic() + MatchEventFeed.DB_RECHECK
+
+        while not events and time.monotonic() < deadline:
+            time.sleep(MatchEventFeed.POLL_INTERVAL)
+            last = get_last_match_event(match_id)
+            if last is not None:
+                if last > since_id:
+                    events = MatchEventFeed.fetch(match_id, since_id)
+            elif time.monotonic() >= next_db_check:
+                # Event written by a process this cache cannot see
+                events = MatchEventFeed.fetch(match_id, since_id)
+                next_db_check = time.monotonic() + MatchEventFeed.DB_RECHECK
+        return events
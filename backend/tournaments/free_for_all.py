@@ -0,0 +1,158 @@
+"""Free-for-all format: multi-player heats and placement scoring"""
+import math
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from .caching import bump_bracket_version
+from .models import MatchParticipant, TournamentEntry, TournamentMatch, TournamentRound, TournamentStanding
+
+
+class FreeForAllEngine:
+    """Generate heats for ``Tournament.Format.FREE_FOR_ALL`` and score them"""
+
+    @staticmethod
+    def distribute_heats(entries, heat_size):
+        """Split seeded ``entries`` into heats with a serpentine draw.
+
+        Seeds are dealt 1..H, H..1, 1..H across the heats, so every heat gets
+        a similar spread of strong and weak players and heat sizes differ by
+        at most one.
+        """
+        num_heats = max(1, math.ceil(len(entries) / heat_size))
+        heats = [[] for _ in range(num_heats)]
+        for i, entry in enumerate(entries):
+            row, col = divmod(i, num_heats)
+            heats[col if row % 2 == 0 else num_heats - 1 - col].append(entry)
+        return heats
+
+    @staticmethod
+    def placement_points(tournament, placement):
+        """Points for finishing ``placement`` in a heat (winner earns heat_size - 1)"""
+        return max(tournament.heat_size - placement, 0)
+
+    @staticmethod
+    def generate_round(tournament, round_number):
+        """Bulk-create the heats for ``round_number``.
+
+        Round 1 is seeded by ``seed_number``; later rounds are seeded by the
+        current standings so leaders are spread across heats.
+        """
+        entries = tournament.entries.filter(status=TournamentEntry.Status.CONFIRMED)
+        if round_number == 1:
+            entries = entries.order_by("seed_number", "registered_at")
+        else:
+            entries = entries.order_by("standings__rank", "seed_number", "registered_at")
+        entries = list(entries)
+        if len(entries) < 2:
+            return False
+
+        heats = FreeForAllEngine.distribute_heats(entries, tournament.heat_size)
+
+        with transaction.atomic():
+            round_obj, _ = TournamentRound.objects.get_or_create(
+                tournament=tournament,
+                round_number=round_number,
+                is_losers_bracket=False,
+                defaults={"name": f"Round {round_number}", "started_at": timezone.now()},
+            )
+            matches = TournamentMatch.objects.bulk_create([
+                TournamentMatch(tournament=tournament, round=round_obj, match_number=i + 1)
+                for i in range(len(heats))
+            ])
+            MatchParticipant.objects.bulk_create(
+                [
+                    MatchParticipant(match=match, entry=entry)
+                    for match, heat in zip(matches, heats)
+                    for entry in heat
+                ],
+                batch_size=500,
+            )
+            bump_bracket_version(tournament.pk)
+        return True
+
+    @staticmethod
+    def record_heat_result(match, results):
+        """Store placements for a heat.
+
+        ``results`` is a list of ``{"entry_id", "placement", "score"}`` dicts
+        covering every participant. Standings are recomputed once, when the
+        last heat of the round is completed. Raises ``ValueError`` on bad input.
+        """
+        tournament = match.tournament
+        participants = {p.entry_id: p for p in match.participants.all()}
+        by_entry = {r["entry_id"]: r for r in results}
+        if set(by_entry) != set(participants):
+            raise ValueError("Results must cover exactly the heat's participants")
+
+        placements = sorted(r["placement"] for r in results)
+        if placements[0] < 1 or placements[-1] > len(placements):
+            raise ValueError("Placements must be between 1 and the number of participants")
+
+        for entry_id, participant in participants.items():
+            result = by_entry[entry_id]
+            participant.placement = result["placement"]
+            participant.score = result.get("score", 0)
+            participant.points = FreeForAllEngine.placement_points(tournament, participant.placement)
+
+        winner_id = min(by_entry.values(), key=lambda r: r["placement"])["entry_id"]
+
+        with transaction.atomic():
+            MatchParticipant.objects.bulk_update(participants.values(), ["placement", "score", "points"])
+            match.winner_entry_id = winner_id
+            match.status = TournamentMatch.Status.COMPLETED
+            match.completed_at = timezone.now()
+            match.save(update_fields=["winner_entry", "status", "completed_at"])
+
+            round_open = TournamentMatch.objects.filter(round_id=match.round_id).exclude(
+                status__in=[TournamentMatch.Status.COMPLETED, TournamentMatch.Status.WALKOVER, TournamentMatch.Status.CANCELLED]
+            ).exists()
+            if not round_open:
+                TournamentRound.objects.filter(pk=match.round_id).update(completed_at=match.completed_at)
+                FreeForAllEngine.recompute_standings(tournament)
+        return not round_open
+
+    @staticmethod
+    def recompute_standings(tournament):
+        """Rebuild aggregate standings from every scored heat in one query"""
+        totals = (
+            MatchParticipant.objects.filter(match__tournament=tournament, placement__isnull=False)
+            .values("entry_id")
+            .annotate(
+                heats=Count("id"),
+                heat_wins=Count("id", filter=Q(placement=1)),
+                total_points=Sum("points"),
+                total_score=Sum("score"),
+                best_score=Max("score"),
+            )
+            .order_by("-total_points", "-heat_wins", "-total_score", "entry_id")
+        )
+
+        standings = []
+        for rank, row in enumerate(totals, start=1):
+            standings.append(TournamentStanding(
+                tournament=tournament,
+                entry_id=row["entry_id"],
+                rank=rank,
+                matches_played=row["heats"],
+                matches_won=row["heat_wins"],
+                matches_lost=row["heats"] - row["heat_wins"],
+                tournament_points=row["total_points"],
+                points_for=row["total_score"],
+                points_difference=row["total_score"],
+                highest_score=row["best_score"],
+                average_score=round(row["total_score"] / row["heats"], 2),
+            ))
+
+        TournamentStanding.objects.bulk_create(
+            standings,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["tournament", "entry"],
+            update_fields=[
+                "rank", "matches_played", "matches_won", "matches_lost", "tournament_points",
+                "points_for", "points_difference", "highest_score", "average_score", "last_updated",
+            ],
+        )
+        return standings
@@ -0,0 +1,103 @@
+"""Bulk tournament invitations and their expiry"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .access import TournamentAccessIndex
+from .caching import bump_list_version
+from .entry_import import EntryImporter
+from .models import TournamentAccess, TournamentInvitation
+
+
+class InvitationService:
+    """Invite many players with a fixed number of queries per chunk, and expire them in chunks"""
+
+    CHUNK_SIZE = 500
+    SWEEP_CHUNK_SIZE = 1000
+    DEFAULT_TTL = timedelta(days=7)
+
+    @staticmethod
+    def invite(tournament, invited_by, player_ids=(), emails=(), message="", expires_at=None):
+        """Invite players by ID and/or email.
+
+        Returns ``{"invited", "duplicates", "missing", "expires_at"}``; the
+        first two hold player IDs, ``missing`` the keys that matched nobody.
+        """
+        expires_at = expires_at or timezone.now() + InvitationService.DEFAULT_TTL
+        result = {"invited": [], "duplicates": [], "missing": [], "expires_at": expires_at}
+        invited = set()  # Mirrors result["invited"] for membership checks across chunks
+
+        player_ids = list(dict.fromkeys(player_ids))
+        emails = list(dict.fromkeys(email.lower() for email in emails))
+        for lookup, keys in (("id", player_ids), ("email", emails)):
+            for start in range(0, len(keys), InvitationService.CHUNK_SIZE):
+                InvitationService._invite_chunk(
+                    tournament, invited_by, lookup, keys[start:start + InvitationService.CHUNK_SIZE], message, expires_at,
+                    result, invited,
+                )
+
+        if result["invited"]:
+            # bulk_create skips the post_save receivers
+            TournamentAccessIndex.grant(tournament.pk, result["invited"], TournamentAccess.Source.INVITATION)
+            bump_list_version()
+        return result
+
+    @staticmethod
+    def _invite_chunk(tournament, invited_by, lookup, keys, message, expires_at, result, invited):
+        found = EntryImporter.find_players(lookup, keys)
+        result["missing"].extend(key for key in keys if key not in found)
+
+        candidates = [found[key][0] for key in keys if key in found and found[key][0] != tournament.organizer_id]
+        existing = set(
+            TournamentInvitation.objects.filter(tournament_id=tournament.pk, player_id__in=candidates)
+            .values_list("player_id", flat=True)
+        )
+        result["duplicates"].extend(player_id for player_id in candidates if player_id in existing and player_id not in invited)
+        new_ids = [player_id for player_id in candidates if player_id not in existing and player_id not in invited]
+        if not new_ids:
+            return
+
+        TournamentInvitation.objects.bulk_create(
+            [
+                TournamentInvitation(
+                    tournament_id=tournament.pk, player_id=player_id, invited_by=invited_by,
+                    message=message, expires_at=expires_at,
+                )
+                for player_id in new_ids
+            ],
+            batch_size=InvitationService.CHUNK_SIZE,
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts drops rows a concurrent invite inserted first; keep only ours
+        inserted = set(
+            TournamentInvitation.objects.filter(
+                tournament_id=tournament.pk, player_id__in=new_ids, invited_by=invited_by, expires_at=expires_at
+            ).values_list("player_id", flat=True)
+        )
+        for player_id in new_ids:
+            if player_id in inserted:
+                result["invited"].append(player_id)
+                invited.add(player_id)
+            else:
+                result["duplicates"].append(player_id)
+
+    @staticmethod
+    def expire_due(now=None, chunk_size=None):
+        """Move past-due pending invitations to ``EXPIRED``; returns how many.
+
+        Each chunk selects IDs through the partial ``(expires_at) WHERE
+        status = 'PENDING'`` index and updates them by primary key, so no
+        statement scans the table or holds locks on more than one chunk.
+        """
+        now = now or timezone.now()
+        chunk_size = chunk_size or InvitationService.SWEEP_CHUNK_SIZE
+        pending = TournamentInvitation.objects.filter(status=TournamentInvitation.Status.PENDING, expires_at__lte=now)
+        expired = 0
+        while True:
+            ids = list(pending.order_by("expires_at").values_list("pk", flat=True)[:chunk_size])
+            if not ids:
+                return expired
+            # Re-check the status: a player may have answered since the SELECT
+            expired += pending.filter(pk__in=ids).update(status=TournamentInvitation.Status.EXPIRED)
+            if len(ids) < chunk_size:
+                return expired
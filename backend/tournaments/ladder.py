@@ -0,0 +1,119 @@
+"""Ladder format: rung positions, challenges and result resolution"""
+from django.db import transaction
+from django.db.models import Case, F, Max, Q, Value, When
+
+from .models import TournamentEntry, TournamentMatch, TournamentRound
+
+
+class LadderEngine:
+    """Maintain ladder positions for ``Tournament.Format.LADDER`` events.
+
+    Position 1 is the top rung. The challenger is always stored as
+    ``player1_entry`` and the defender as ``player2_entry`` of the match.
+    """
+
+    OPEN_STATUSES = [TournamentMatch.Status.SCHEDULED, TournamentMatch.Status.IN_PROGRESS]
+
+    @staticmethod
+    def initialize(tournament):
+        """Place confirmed entries on the ladder in seed/registration order"""
+        entries = list(
+            tournament.entries.filter(status=TournamentEntry.Status.CONFIRMED).order_by("seed_number", "registered_at")
+        )
+        if len(entries) < 2:
+            return False
+
+        for position, entry in enumerate(entries, start=1):
+            entry.ladder_position = position
+        TournamentEntry.objects.bulk_update(entries, ["ladder_position"], batch_size=500)
+
+        # All challenges live in a single open-ended round
+        TournamentRound.objects.get_or_create(
+            tournament=tournament,
+            round_number=1,
+            is_losers_bracket=False,
+            defaults={"name": "Ladder"},
+        )
+        return True
+
+    @staticmethod
+    def challengeable_entries(tournament, entry):
+        """Entries up to ``ladder_challenge_range`` rungs above ``entry`` (index range scan)"""
+        if entry.ladder_position is None:
+            return TournamentEntry.objects.none()
+
+        lowest = max(1, entry.ladder_position - tournament.ladder_challenge_range)
+        return TournamentEntry.objects.filter(
+            tournament=tournament,
+            status=TournamentEntry.Status.CONFIRMED,
+            ladder_position__gte=lowest,
+            ladder_position__lt=entry.ladder_position,
+        ).select_related("player").order_by("ladder_position")
+
+    @staticmethod
+    def create_challenge(tournament, challenger, defender):
+        """Create a challenge match; raises ``ValueError`` if it is not allowed"""
+        if challenger.ladder_position is None or defender.ladder_position is None:
+            raise ValueError("Both players must be on the ladder")
+
+        gap = challenger.ladder_position - defender.ladder_position
+        if gap <= 0:
+            raise ValueError("You can only challenge players above you")
+        if gap > tournament.ladder_challenge_range:
+            raise ValueError(f"You can only challenge up to {tournament.ladder_challenge_range} rungs above you")
+
+        involved = [challenger.pk, defender.pk]
+        if TournamentMatch.objects.filter(
+            tournament=tournament,
+            status__in=LadderEngine.OPEN_STATUSES,
+        ).filter(
+            Q(player1_entry_id__in=involved) | Q(player2_entry_id__in=involved)
+        ).exists():
+            raise ValueError("One of the players already has an open challenge")
+
+        round_obj = TournamentRound.objects.get(tournament=tournament, round_number=1, is_losers_bracket=False)
+        last_number = round_obj.matches.aggregate(last=Max("match_number"))["last"] or 0
+
+        return TournamentMatch.objects.create(
+            tournament=tournament,
+            round=round_obj,
+            match_number=last_number + 1,
+            player1_entry=challenger,
+            player2_entry=defender,
+        )
+
+    @staticmethod
+    def resolve_challenge(match, winner_entry):
+        """Apply a completed challenge to the ladder.
+
+        A successful challenger takes the defender's rung and everyone from
+        the defender down to the challenger's old rung drops one place. The
+        shift is a single set-based UPDATE over at most
+        ``ladder_challenge_range + 1`` rows, so the cost does not depend on
+        the size of the ladder.
+        """
+        if not winner_entry or winner_entry.pk != match.player1_entry_id or not match.player2_entry_id:
+            return False  # Defender held their rung
+
+        with transaction.atomic():
+            positions = dict(
+                TournamentEntry.objects.select_for_update()
+                .filter(pk__in=[match.player1_entry_id, match.player2_entry_id])
+                .values_list("pk", "ladder_position")
+            )
+            challenger_pos = positions.get(match.player1_entry_id)
+            defender_pos = positions.get(match.player2_entry_id)
+            if challenger_pos is None or defender_pos is None or defender_pos >= challenger_pos:
+                return False
+
+            TournamentEntry.objects.filter(
+                tournament_id=match.tournament_id,
+                ladder_position__gte=defender_pos,
+                ladder_position__lte=challenger_pos,
+            ).update(
+                ladder_position=Case(
+                    When(pk=match.player1_entry_id, then=Value(defender_pos)),
+                    default=F("ladder_position") + 1,
+                )
+            )
+        return True
@@ -0,0 +1,113 @@
+"""Global rating leaderboard: cached top pages, rank lookups and around-me windows"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Value, Window
+from django.db.models.functions import DenseRank
+
+from .caching import get_leaderboard_version
+from .models import LeaderboardRank, PlayerTournamentRating
+from .serializers import LeaderboardEntrySerializer
+
+
+class Leaderboard:
+    """Dense-ranked view of ``PlayerTournamentRating`` (equal ratings share a rank).
+
+    Ranks always come from the database, never from enumerating rows in
+    Python: pages are ranked with ``DENSE_RANK()``, and single-rating
+    lookups read ``LeaderboardRank``, a table of ``DENSE_RANK()`` per
+    distinct rating that a periodic task rebuilds (so a lookup may lag the
+    latest results by one rebuild interval).
+    """
+
+    MAX_PAGE_SIZE = 200
+    DEFAULT_PAGE_SIZE = 50
+    MAX_WINDOW = 50
+    CACHE_TIMEOUT = 300
+
+    TIERS = [value for value, _ in PlayerTournamentRating._meta.get_field("skill_tier").choices]
+
+    @staticmethod
+    def base(tier=None):
+        queryset = PlayerTournamentRating.objects.select_related("player")
+        if tier:
+            queryset = queryset.filter(skill_tier=tier)
+        return queryset
+
+    @staticmethod
+    def ranked(queryset, offset=0):
+        """Annotate ``rank`` over ``queryset``, shifted by ``offset`` ranks"""
+        return queryset.annotate(
+            rank=Window(DenseRank(), order_by=F("rating").desc()) + Value(offset)
+        ).order_by("-rating", "id")
+
+    @staticmethod
+    def top(limit=DEFAULT_PAGE_SIZE, tier=None):
+        """Leading ``limit`` rows; the first ``MAX_PAGE_SIZE`` are cached per tier"""
+        limit = max(1, min(limit, Leaderboard.MAX_PAGE_SIZE))
+        key = f"ratings:leaderboard:{get_leaderboard_version()}:{tier or 'ALL'}"
+        rows = cache.get(key)
+        if rows is None:
+            page = Leaderboard.ranked(Leaderboard.base(tier))[:Leaderboard.MAX_PAGE_SIZE]
+            rows = list(LeaderboardEntrySerializer(page, many=True).data)
+            cache.set(key, rows, Leaderboard.CACHE_TIMEOUT)
+        return rows[:limit]
+
+    @staticmethod
+    def rebuild_ranks():
+        """Rewrite ``LeaderboardRank`` from the current ratings; returns the number of rows.
+
+        One pass over the rating indexes per scope; the table holds one row
+        per distinct rating, not per player.
+        """
+        ratings = PlayerTournamentRating.objects.order_by()
+        overall = ratings.annotate(rank=Window(DenseRank(), order_by=F("rating").desc())).values_list("rating", "rank")
+        by_tier = ratings.annotate(
+            rank=Window(DenseRank(), partition_by=F("skill_tier"), order_by=F("rating").desc())
+        ).values_list("skill_tier", "rating", "rank")
+        rows = [LeaderboardRank(tier="", rating=rating, rank=rank) for rating, rank in overall.distinct()]
+        rows += [LeaderboardRank(tier=tier, rating=rating, rank=rank) for tier, rating, rank in by_tier.distinct()]
+        with transaction.atomic():
+            LeaderboardRank.objects.all().delete()
+            LeaderboardRank.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    @staticmethod
+    def rank_of(rating, tier=None):
+        """Dense rank of ``rating``: one O(log n) seek on the ``(tier, rating)`` index of ``LeaderboardRank``.
+
+        The nearest stored rating at or above ``rating`` gives the rank; a
+        rating newer than the last rebuild ranks just below it. The table is
+        built on first use if the periodic task has not run yet.
+        """
+        nearest = (
+            LeaderboardRank.objects.filter(tier=tier or "", rating__gte=rating)
+            .order_by("rating").values_list("rating", "rank").first()
+        )
+        if nearest is None:
+            if not LeaderboardRank.objects.exists() and Leaderboard.rebuild_ranks():
+                return Leaderboard.rank_of(rating, tier)
+            return 1
+        stored, rank = nearest
+        return rank if stored == rating else rank + 1
+
+    @staticmethod
+    def around(rating, k=5, tier=None):
+        """Rows within ``k`` ranks of ``rating``.
+
+        The ``k`` distinct ratings on either side bound the window, so only
+        the rows inside it are read and ranked; the window's dense rank is
+        offset by the rank of its highest rating. At most ``MAX_PAGE_SIZE``
+        rows are returned even when many players share a rating.
+        """
+        k = max(0, min(k, Leaderboard.MAX_WINDOW))
+        queryset = Leaderboard.base(tier)
+        ratings = queryset.values_list("rating", flat=True).distinct()
+        above = list(ratings.filter(rating__gt=rating).order_by("rating")[:k])
+        below = list(ratings.filter(rating__lt=rating).order_by("-rating")[:k])
+
+        rank = Leaderboard.rank_of(rating, tier)
+        window = queryset.filter(
+            rating__lte=above[-1] if above else rating,
+            rating__gte=below[-1] if below else rating,
+        )
+        return rank, Leaderboard.ranked(window, offset=rank - len(above) - 1)[:Leaderboard.MAX_PAGE_SIZE]
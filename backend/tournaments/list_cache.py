@@ -0,0 +1,49 @@
+"""Shared response cache for the tournament list endpoints"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+from .access import TournamentAccessIndex
+from .caching import get_list_version
+
+
+class TournamentListCache:
+    """Cache list responses once for everyone, keyed by action and query string.
+
+    Cached responses only ever contain public tournaments. A signed-in
+    user whose private tournaments (organized, entered or invited to) would appear is
+    served the shared response merged with those, using a per-user set of
+    private tournament IDs that is cached alongside. Every entry is keyed
+    by the list version, which is bumped by tournament and entry saves.
+    """
+
+    TIMEOUT = 60  # "Upcoming" filters on the clock, so entries also expire
+    KEY = "tournaments:list:v{version}:{action}:{params}"
+    PRIVATE_IDS_KEY = "tournaments:user:{user_id}:private-ids:v{version}"
+
+    @staticmethod
+    def key(action, query_params):
+        params = urlencode(sorted(query_params.lists()), doseq=True)
+        digest = hashlib.sha1(params.encode()).hexdigest()
+        return TournamentListCache.KEY.format(version=get_list_version(), action=action, params=digest)
+
+    @staticmethod
+    def get_or_build(action, query_params, build):
+        """The cached public response data, calling ``build()`` on a miss"""
+        key = TournamentListCache.key(action, query_params)
+        data = cache.get(key)
+        if data is None:
+            data = build()
+            cache.set(key, data, TournamentListCache.TIMEOUT)
+        return data
+
+    @staticmethod
+    def private_ids(user):
+        """IDs of private tournaments ``user`` organizes, entered or was invited to"""
+        key = TournamentListCache.PRIVATE_IDS_KEY.format(user_id=user.pk, version=get_list_version())
+        ids = cache.get(key)
+        if ids is None:
+            ids = TournamentAccessIndex.private_ids(user)
+            cache.set(key, ids, TournamentListCache.TIMEOUT)
+        return ids
@@ -0,0 +1,237 @@
+"""Live scoreboard stream: one multiplexed feed of match deltas per tournament"""
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import BaseRenderer
+
+from .caching import get_bracket_version, next_live_sequence
+from .models import TournamentEntry, TournamentMatch
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets ``Accept: text/event-stream`` clients through content negotiation"""
+
+    media_type = "text/event-stream"
+    format = "sse"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode()
+
+
+class Subscription:
+    """A reader's queue of messages for one tournament"""
+
+    def __init__(self, broker, tournament_id, messages):
+        self.broker = broker
+        self.tournament_id = tournament_id
+        self.messages = messages
+
+    def get(self, timeout):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self.tournament_id, self.messages)
+
+
+class InProcessBroker:
+    """Fan messages out to subscriber queues inside this process.
+
+    Only screens connected to the publishing process see its messages, so
+    this is for development and single-process deployments; production
+    sets ``REDIS_URL`` and gets ``RedisBroker``.
+
+    A reader that falls ``MAX_BACKLOG`` messages behind has its queue
+    replaced by a single ``resync`` message instead of holding the publisher
+    up, and reloads the snapshot.
+    """
+
+    MAX_BACKLOG = 500
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, tournament_id):
+        messages = queue.Queue(maxsize=self.MAX_BACKLOG)
+        with self._lock:
+            self._subscribers[tournament_id].add(messages)
+        return Subscription(self, tournament_id, messages)
+
+    def unsubscribe(self, tournament_id, messages):
+        with self._lock:
+            self._subscribers[tournament_id].discard(messages)
+            if not self._subscribers[tournament_id]:
+                del self._subscribers[tournament_id]
+
+    def publish(self, tournament_id, message):
+        self.deliver(tournament_id, message)
+
+    def deliver(self, tournament_id, message):
+        with self._lock:
+            targets = list(self._subscribers.get(tournament_id, ()))
+        for messages in targets:
+            try:
+                messages.put_nowait(message)
+            except queue.Full:
+                with messages.mutex:
+                    messages.queue.clear()
+                messages.put_nowait({"type": "resync"})
+
+
+class RedisBroker(InProcessBroker):
+    """Publish once to Redis; one listener thread per process feeds local readers"""
+
+    CHANNEL = "tournaments:live"
+
+    def __init__(self, url):
+        import redis
+
+        super().__init__()
+        self._redis = redis.Redis.from_url(url)
+        self._listener = None
+
+    def publish(self, tournament_id, message):
+        self._redis.publish(self.CHANNEL, json.dumps({"tournament": tournament_id, "message": message}))
+
+    def subscribe(self, tournament_id):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name="tournament-live", daemon=True)
+                self._listener.start()
+        return super().subscribe(tournament_id)
+
+    def _listen(self):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.CHANNEL)
+        for item in pubsub.listen():
+            data = json.loads(item["data"])
+            self.deliver(data["tournament"], data["message"])
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Process-wide broker: Redis when ``REDIS_URL`` is set, in-process otherwise"""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            redis_url = getattr(settings, "REDIS_URL", "")
+            _broker = RedisBroker(redis_url) if redis_url else InProcessBroker()
+    return _broker
+
+
+class LiveScoreboard:
+    """Snapshot + delta stream of every match in a tournament"""
+
+    KEEPALIVE = 15
+    MAX_DURATION = 300  # EventSource clients reconnect and resync from the snapshot
+    RETRY_MS = 3000
+    SNAPSHOT_TIMEOUT = 3600
+
+    MATCH_FIELDS = [
+        "id", "round__round_number", "match_number", "status", "player1_entry_id", "player2_entry_id",
+        "player1_score", "player2_score", "winner_entry_id", "next_match_id", "board_number",
+    ]
+
+    @staticmethod
+    def match_state(match):
+        """Compact state of a ``TournamentMatch`` pushed to screens"""
+        return {
+            "id": match.pk,
+            "status": match.status,
+            "player1": match.player1_entry_id,
+            "player2": match.player2_entry_id,
+            "score": [match.player1_score, match.player2_score],
+            "winner": match.winner_entry_id,
+            "next": match.next_match_id,
+            "board": match.board_number,
+        }
+
+    @staticmethod
+    def snapshot(tournament):
+        """Full scoreboard, cached per bracket version (two queries on a miss)"""
+        version = get_bracket_version(tournament.pk)
+        key = f"tournament:{tournament.pk}:live-snapshot:{version}"
+        document = cache.get(key)
+        if document is None:
+            matches = TournamentMatch.objects.filter(tournament_id=tournament.pk).order_by(
+                "round__round_number", "match_number"
+            ).values_list(*LiveScoreboard.MATCH_FIELDS)
+            document = {
+                "tournament": tournament.pk,
+                "status": tournament.status,
+                "current_round": tournament.current_round,
+                "entries": dict(
+                    TournamentEntry.objects.filter(tournament_id=tournament.pk).values_list("pk", "player__email")
+                ),
+                "matches": [
+                    {
+                        "id": match_id,
+                        "round": round_number,
+                        "number": number,
+                        "status": status,
+                        "player1": player1,
+                        "player2": player2,
+                        "score": [score1, score2],
+                        "winner": winner,
+                        "next": next_match,
+                        "board": board,
+                    }
+                    for match_id, round_number, number, status, player1, player2, score1, score2, winner, next_match, board in matches
+                ],
+            }
+            cache.set(key, document, LiveScoreboard.SNAPSHOT_TIMEOUT)
+        return document
+
+    @staticmethod
+    def publish_match(tournament_id, state):
+        """Push one match delta to every reader of the tournament"""
+        message = {"type": "match", "seq": next_live_sequence(tournament_id), "match": state}
+        get_broker().publish(tournament_id, message)
+        return message
+
+    @staticmethod
+    def format_event(event, data, event_id=None):
+        lines = [f"event: {event}"]
+        if event_id is not None:
+            lines.append(f"id: {event_id}")
+        lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+        return "\n".join(lines) + "\n\n"
+
+    @staticmethod
+    def stream(tournament, max_duration=MAX_DURATION, keepalive=KEEPALIVE):
+        """Server-sent events: a ``snapshot`` followed by ``match`` deltas.
+
+        Each open stream holds a server thread for up to ``max_duration``
+        seconds; deploy with threaded workers (see ``entrypoint.sh``).
+
+        The subscription is opened before the snapshot is read, so no change
+        can fall between the two; a delta that is already in the snapshot is
+        simply applied twice.
+        """
+        subscription = get_broker().subscribe(tournament.pk)
+        try:
+            yield f"retry: {LiveScoreboard.RETRY_MS}\n\n"
+            yield LiveScoreboard.format_event("snapshot", LiveScoreboard.snapshot(tournament))
+
+            deadline = time.monotonic() + max_duration
+            while time.monotonic() < deadline:
+                message = subscription.get(timeout=min(keepalive, max(deadline - time.monotonic(), 0)))
+                if message is None:
+                    yield ": keepalive\n\n"
+                elif message["type"] == "resync":
+                    yield LiveScoreboard.format_event("snapshot", LiveScoreboard.snapshot(tournament))
+                else:
+                    yield LiveScoreboard.format_event(message["type"], message["match"], message["seq"])
+        finally:
+            subscription.close()
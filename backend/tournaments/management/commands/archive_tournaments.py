@@ -0,0 +1,31 @@
+"""Write archived documents for completed tournaments"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from tournaments.archive import TournamentArchiver
+from tournaments.models import Tournament
+
+
+class Command(BaseCommand):
+    help = "Archive completed tournaments that have no archived document yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Rewrite existing archives as well",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        tournaments = Tournament.objects.filter(status=Tournament.Status.COMPLETED)
+        if not options["rebuild"]:
+            tournaments = tournaments.filter(archive__isnull=True)
+        count = size = 0
+        for tournament in tournaments.iterator():
+            size += TournamentArchiver.archive(tournament)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {count} tournaments ({size / 1024:.1f} KiB compressed) in {time.perf_counter() - start:.2f}s"
+        ))
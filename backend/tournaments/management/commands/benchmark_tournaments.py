@@ -0,0 +1,236 @@
+"""Micro-benchmarks for tournament engines.
+
+Every suite runs inside a transaction that is rolled back, so the command is
+safe to point at a development database.
+"""
+import math
+import statistics
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from tournaments.bracket_generator import BracketGenerator
+from tournaments.ladder import LadderEngine
+from tournaments.predictor import BracketPredictor
+from tournaments.ratings import RatingEngine
+from tournaments.scheduler import MatchScheduler
+from tournaments.tiebreaks import TiebreakEngine
+from tournaments.models import PlayerTournamentRating, Tournament, TournamentEntry, TournamentMatch, TournamentRound
+
+
+class Command(BaseCommand):
+    help = "Benchmark tournament engines on synthetic data (nothing is persisted)"
+
+    SUITES = ["ladder", "scheduler", "ratings", "predictor", "tiebreaks", "round_robin"]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--suite", choices=self.SUITES, action="append", help="Suite to run (repeatable, default: all)")
+        parser.add_argument("--sizes", default="500,1000,2000", help="Comma separated field sizes")
+        parser.add_argument("--repeat", type=int, default=50, help="Operations timed per size")
+        parser.add_argument("--matches", type=int, default=1_000_000, help="Synthetic matches replayed by the ratings suite")
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+        for suite in options["suite"] or self.SUITES:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {suite} =="))
+            getattr(self, f"bench_{suite}")(sizes, options)
+
+    # Helpers
+
+    def _report(self, label, timings, queries):
+        timings_ms = sorted(t * 1000 for t in timings)
+        p95 = timings_ms[max(0, math.ceil(len(timings_ms) * 0.95) - 1)]
+        self.stdout.write(
+            f"{label:>24}  median {statistics.median(timings_ms):8.3f} ms  "
+            f"p95 {p95:8.3f} ms  queries/op {queries}"
+        )
+
+    @staticmethod
+    def _synthetic_tournament(size, tournament_format, **extra):
+        """Create an organizer, ``size`` confirmed entries and their tournament"""
+        now = timezone.now()
+        stamp = time.time_ns()
+        organizer = User.objects.create_user(email=f"bench-org-{stamp}@bench.local")
+        players = User.objects.bulk_create(
+            [User(email=f"bench-{stamp}-{i}@bench.local", password="!") for i in range(size)],
+            batch_size=1000,
+        )
+        tournament = Tournament.objects.create(
+            name=f"Benchmark {tournament_format} {size}",
+            organizer=organizer,
+            tournament_format=tournament_format,
+            max_participants=max(size, 2),
+            min_participants=2,
+            registration_start=now - timedelta(days=2),
+            registration_end=now - timedelta(days=1),
+            start_time=now,
+            status=Tournament.Status.REGISTRATION_CLOSED,
+            confirmed_count=size,
+            **extra,
+        )
+        TournamentEntry.objects.bulk_create(
+            [
+                TournamentEntry(tournament=tournament, player=player, status=TournamentEntry.Status.CONFIRMED, seed_number=i + 1)
+                for i, player in enumerate(players)
+            ],
+            batch_size=1000,
+        )
+        return tournament
+
+    # Suites
+
+    def bench_ladder(self, sizes, options):
+        """Time a successful challenge at the bottom of ladders of growing size"""
+        for size in sizes:
+            with transaction.atomic():
+                tournament = self._synthetic_tournament(size, Tournament.Format.LADDER)
+                LadderEngine.initialize(tournament)
+                round_obj = TournamentRound.objects.get(tournament=tournament, round_number=1)
+                entries = {e.ladder_position: e for e in tournament.entries.all()}
+                reach = tournament.ladder_challenge_range
+
+                timings = []
+                queries = 0
+                for i in range(options["repeat"]):
+                    challenger = entries[size]
+                    defender = entries[size - reach]
+                    match = TournamentMatch.objects.create(
+                        tournament=tournament,
+                        round=round_obj,
+                        match_number=i + 1,
+                        player1_entry=challenger,
+                        player2_entry=defender,
+                    )
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = time.perf_counter()
+                        LadderEngine.resolve_challenge(match, challenger)
+                        timings.append(time.perf_counter() - start)
+                    queries = len(ctx.captured_queries)
+                    # Positions shifted, refresh the bottom of the ladder only
+                    for entry in TournamentEntry.objects.filter(
+                        tournament=tournament, ladder_position__gte=size - reach
+                    ):
+                        entries[entry.ladder_position] = entry
+
+                self._report(f"ladder n={size}", timings, queries)
+                transaction.set_rollback(True)
+
+    def bench_scheduler(self, sizes, options):
+        """Plan full single-elimination brackets (512 players is the format maximum)"""
+        for size in sizes:
+            with transaction.atomic():
+                tournament = self._synthetic_tournament(min(size, 512), Tournament.Format.SINGLE_ELIMINATION, num_boards=16)
+                BracketGenerator.generate_single_elimination(tournament)
+
+                timings = []
+                queries = 0
+                for _ in range(max(1, options["repeat"] // 10)):
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = time.perf_counter()
+                        MatchScheduler.schedule(tournament)
+                        timings.append(time.perf_counter() - start)
+                    queries = len(ctx.captured_queries)
+
+                self._report(f"schedule n={min(size, 512)}", timings, queries)
+                transaction.set_rollback(True)
+
+    def bench_ratings(self, sizes, options):
+        """Replay ``--matches`` random results among player pools of each size (no database)"""
+        rng = np.random.default_rng(180)
+        num_matches = options["matches"]
+        for size in sizes:
+            p1 = rng.integers(0, size, num_matches)
+            p2 = (p1 + rng.integers(1, size, num_matches)) % size  # Never paired with themselves
+            score = (rng.random(num_matches) < 0.5).astype(float)
+            slices = len(RatingEngine.slices(p1, p2, size))
+
+            for system in RatingEngine.SYSTEMS:
+                start = time.perf_counter()
+                RatingEngine.replay(p1, p2, score, size, system)
+                self._report(f"{system} n={size} m={num_matches}", [time.perf_counter() - start], 0)
+            self.stdout.write(f"{'':>24}  {slices} slices, {num_matches / slices:.0f} matches per slice")
+
+    def bench_predictor(self, sizes, options):
+        """Simulate full single-elimination brackets (512 players is the format maximum)"""
+        rng = np.random.default_rng(180)
+        for size in sizes:
+            size = min(size, 512)
+            with transaction.atomic():
+                tournament = self._synthetic_tournament(size, Tournament.Format.SINGLE_ELIMINATION)
+                PlayerTournamentRating.objects.bulk_create(
+                    [
+                        PlayerTournamentRating(player_id=player_id, rating=int(rating))
+                        for player_id, rating in zip(
+                            tournament.entries.values_list("player_id", flat=True), rng.normal(1500, 200, size)
+                        )
+                    ],
+                    batch_size=1000,
+                )
+                BracketGenerator.generate_single_elimination(tournament)
+
+                with CaptureQueriesContext(connection) as ctx:
+                    entries, ratings, rounds = BracketPredictor.load(tournament)
+                queries = len(ctx.captured_queries)
+
+                timings = []
+                for _ in range(max(1, options["repeat"] // 25)):
+                    start = time.perf_counter()
+                    BracketPredictor.simulate(rounds, ratings, BracketPredictor.SIMULATIONS, rng)
+                    timings.append(time.perf_counter() - start)
+
+                self._report(f"{BracketPredictor.SIMULATIONS} sims n={size}", timings, queries)
+                transaction.set_rollback(True)
+
+    def bench_tiebreaks(self, sizes, options):
+        """Full standings tables for round-robin and Swiss fields of each size (no database)"""
+        rng = np.random.default_rng(180)
+        for size in sizes:
+            # Round robin: every pairing once
+            p1, p2 = np.triu_indices(size, k=1)
+            # Swiss: ceil(log2(n)) rounds of random pairings
+            rounds = math.ceil(math.log2(size))
+            pairs = np.concatenate([rng.permutation(size)[: size - size % 2].reshape(-1, 2) for _ in range(rounds)])
+            fields = {"round robin": (p1, p2), f"swiss {rounds}r": (pairs[:, 0], pairs[:, 1])}
+
+            for label, (p1, p2) in fields.items():
+                result = rng.choice([1.0, 0.5, 0.0], size=len(p1), p=[0.48, 0.04, 0.48])
+                loser_legs = rng.integers(0, 3, len(p1))
+                score1 = np.where(result == 1, 3, np.where(result == 0.5, 2, loser_legs))
+                score2 = np.where(result == 0, 3, np.where(result == 0.5, 2, loser_legs))
+                timings = []
+                for _ in range(max(1, options["repeat"] // 10)):
+                    start = time.perf_counter()
+                    TiebreakEngine.compute(size, p1, p2, score1, score2, result)
+                    timings.append(time.perf_counter() - start)
+                self._report(f"{label} n={size} m={len(p1)}", timings, 0)
+
+    def bench_round_robin(self, sizes, options):
+        """Generate single and double round robins (512 players is the format maximum).
+
+        Query counts grow with matches / INSERT batch size, and the batch is
+        capped by the backend's bound-parameter limit (small on SQLite).
+        """
+        for size in sizes:
+            size = min(size, 512)
+            for cycles in (1, 2):
+                with transaction.atomic():
+                    tournament = self._synthetic_tournament(size, Tournament.Format.ROUND_ROBIN, round_robin_cycles=cycles)
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = time.perf_counter()
+                        BracketGenerator.generate_round_robin(tournament)
+                        elapsed = time.perf_counter() - start
+                    matches = tournament.matches.count()
+                    self._report(f"{cycles}x round robin n={size}", [elapsed], len(ctx.captured_queries))
+                    fields = [field for field in TournamentMatch._meta.concrete_fields if not field.primary_key]
+                    batch = min(1000, connection.ops.bulk_batch_size(fields, [None] * matches) or matches)
+                    self.stdout.write(
+                        f"{'':>24}  {matches} matches, {matches / len(ctx.captured_queries):.0f} rows per query "
+                        f"({connection.vendor} INSERT batch {batch})"
+                    )
+                    transaction.set_rollback(True)
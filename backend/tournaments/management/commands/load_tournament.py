@@ -0,0 +1,213 @@
+"""Drive one synthetic tournament through the real API, phase by phase.
+
+Requests go through the DRF test client (full middleware, authentication,
+serialization and signals), against the configured database. Everything
+the run creates is deleted afterwards unless ``--keep`` is given.
+"""
+import json
+import math
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from tournaments.models import Tournament, TournamentMatch
+
+
+class Phase:
+    """Per-request latency and query counts, plus the phase's peak traced memory"""
+
+    def __init__(self, name):
+        self.name = name
+        self.timings = []
+        self.queries = []
+        self.statuses = {}
+        self.peak_bytes = 0
+
+    def __enter__(self):
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc):
+        self.peak_bytes = tracemalloc.get_traced_memory()[1] - self._baseline
+
+    def request(self, client, method, path, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = getattr(client, method)(path, data, format="json")
+            self.timings.append(time.perf_counter() - start)
+        self.queries.append(len(ctx.captured_queries))
+        self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        return response
+
+    def report(self):
+        timings_ms = sorted(t * 1000 for t in self.timings)
+        return {
+            "requests": len(timings_ms),
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "queries": sum(self.queries),
+            "queries_per_request_max": max(self.queries, default=0),
+            "p50_ms": round(statistics.median(timings_ms), 3) if timings_ms else None,
+            "p95_ms": round(timings_ms[max(0, math.ceil(len(timings_ms) * 0.95) - 1)], 3) if timings_ms else None,
+            "total_ms": round(sum(timings_ms), 3),
+            "peak_memory_kib": round(self.peak_bytes / 1024, 1),
+        }
+
+
+class Command(BaseCommand):
+    help = "Register, start, score and read a synthetic tournament of N players through the API and report each phase"
+
+    FORMATS = [Tournament.Format.SINGLE_ELIMINATION.value, Tournament.Format.ROUND_ROBIN.value, Tournament.Format.SWISS.value]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=512, help="Field size (capped at 512, the max_participants limit)")
+        parser.add_argument("--format", choices=self.FORMATS, default=Tournament.Format.SINGLE_ELIMINATION.value)
+        parser.add_argument("--reads", type=int, default=20, help="Standings and bracket requests timed after the last score")
+        parser.add_argument("--seed", type=int, default=180)
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON (for diffing between releases)")
+        parser.add_argument("--keep", action="store_true", help="Keep the tournament and synthetic players")
+
+    def handle(self, *args, **options):
+        size = max(2, min(options["players"], 512))
+        rng = random.Random(options["seed"])
+        stamp = time.time_ns()
+        phases = []
+
+        tracemalloc.start()
+        # The test client's host, as the test runner would allow it
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            organizer, players, tournament = self._setup(size, options["format"], stamp)
+            try:
+                phases.append(self.phase_register(tournament, players))
+                phases.append(self.phase_start(tournament, organizer))
+                phases.append(self.phase_submit_score(tournament, organizer, rng))
+                phases.append(self.phase_read(tournament, "standings", options["reads"]))
+                phases.append(self.phase_read(tournament, "bracket", options["reads"]))
+                tournament.refresh_from_db()
+                final_status = tournament.status
+            finally:
+                tracemalloc.stop()
+                if not options["keep"]:
+                    tournament.delete()
+                    User.objects.filter(email__endswith=f"@load-{stamp}.local").delete()
+
+        report = {
+            "players": size,
+            "format": options["format"],
+            "final_status": final_status,
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": sys.version.split()[0],
+            "phases": {phase.name: phase.report() for phase in phases},
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._print(report)
+
+    # Setup
+
+    @staticmethod
+    def _setup(size, tournament_format, stamp):
+        now = timezone.now()
+        organizer = User.objects.create_user(email=f"organizer@load-{stamp}.local")
+        players = User.objects.bulk_create(
+            [User(email=f"player-{i}@load-{stamp}.local", password="!") for i in range(size)],
+            batch_size=1000,
+        )
+        tournament = Tournament.objects.create(
+            name=f"Load {tournament_format} {size}",
+            organizer=organizer,
+            tournament_format=tournament_format,
+            max_participants=size,
+            min_participants=2,
+            registration_start=now - timedelta(hours=1),
+            registration_end=now + timedelta(hours=1),
+            start_time=now + timedelta(hours=2),
+            status=Tournament.Status.REGISTRATION_OPEN,
+        )
+        tournament.generate_passcode()
+        tournament.save(update_fields=["score_passcode"])
+        return organizer, players, tournament
+
+    # Phases
+
+    def phase_register(self, tournament, players):
+        """Every player registers; the last confirmed spot closes registration"""
+        client = APIClient()
+        with Phase("register") as phase:
+            for player in players:
+                client.force_authenticate(player)
+                phase.request(client, "post", f"/api/tournaments/{tournament.pk}/register/")
+        return phase
+
+    def phase_start(self, tournament, organizer):
+        client = APIClient()
+        client.force_authenticate(organizer)
+        with Phase("start_tournament") as phase:
+            phase.request(client, "post", f"/api/tournaments/{tournament.pk}/start_tournament/")
+        return phase
+
+    def phase_submit_score(self, tournament, organizer, rng):
+        """The organizer scores every playable match until none is left"""
+        client = APIClient()
+        client.force_authenticate(organizer)
+        path = f"/api/tournaments/{tournament.pk}/submit_score/"
+        with Phase("submit_score") as phase:
+            while True:
+                # Picking the next match is harness work, outside the timed requests
+                match_id = (
+                    TournamentMatch.objects.filter(
+                        tournament=tournament,
+                        status=TournamentMatch.Status.SCHEDULED,
+                        player1_entry__isnull=False,
+                        player2_entry__isnull=False,
+                    )
+                    .order_by("round__round_number", "match_number")
+                    .values_list("pk", flat=True)
+                    .first()
+                )
+                if match_id is None:
+                    break
+                loser_legs = rng.randint(0, 2)
+                scores = (3, loser_legs) if rng.random() < 0.5 else (loser_legs, 3)
+                response = phase.request(client, "post", path, {
+                    "match_id": match_id, "player1_score": scores[0], "player2_score": scores[1],
+                    "passcode": tournament.score_passcode,
+                })
+                if response.status_code != 200:
+                    raise RuntimeError(f"submit_score failed for match {match_id}: {response.status_code} {response.data}")
+        return phase
+
+    def phase_read(self, tournament, endpoint, reads):
+        client = APIClient()
+        with Phase(endpoint) as phase:
+            for _ in range(reads):
+                phase.request(client, "get", f"/api/tournaments/{tournament.pk}/{endpoint}/")
+        return phase
+
+    # Output
+
+    def _print(self, report):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"== {report['format']} n={report['players']} on {report['database']} ({report['final_status']}) =="
+        ))
+        for name, phase in report["phases"].items():
+            if not phase["requests"]:
+                continue
+            self.stdout.write(
+                f"{name:>16}  {phase['requests']:6d} req  p50 {phase['p50_ms']:8.3f} ms  p95 {phase['p95_ms']:8.3f} ms  "
+                f"queries {phase['queries']:7d} (max {phase['queries_per_request_max']}/req)  "
+                f"peak {phase['peak_memory_kib']:9.1f} KiB  statuses {phase['statuses']}"
+            )
@@ -0,0 +1,25 @@
+"""Rebuild player tournament ratings from the full match history"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from tournaments.ratings import RatingEngine
+
+
+class Command(BaseCommand):
+    help = "Replay every completed tournament match and rewrite player ratings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--system",
+            choices=RatingEngine.SYSTEMS,
+            help="Rating system to replay with (default: TOURNAMENT_RATING_SYSTEM)",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        result = RatingEngine.recompute(options["system"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Replayed {result['matches']} matches for {result['players']} players "
+            f"({result['system']}) in {time.perf_counter() - start:.2f}s"
+        ))
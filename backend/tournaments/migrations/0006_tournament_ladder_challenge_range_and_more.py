@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:18
+
+import django.core.validators
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0005_tournament_live_scoring_enabled_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='ladder_challenge_range',
+            field=models.IntegerField(default=3, help_text='How many rungs above themselves a ladder player may challenge', validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AddField(
+            model_name='tournamententry',
+            name='ladder_position',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tournamententry',
+            index=models.Index(fields=['tournament', 'ladder_position'], name='tournaments_tournam_d209f7_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:20
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0006_tournament_ladder_challenge_range_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='heat_size',
+            field=models.IntegerField(default=4, help_text='Players per heat in free-for-all events', validators=[django.core.validators.MinValueValidator(2), django.core.validators.MaxValueValidator(16)]),
+        ),
+        migrations.CreateModel(
+            name='MatchParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('placement', models.IntegerField(blank=True, null=True)),
+                ('score', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0, help_text='Placement points awarded for this heat')),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='heat_results', to='tournaments.tournamententry')),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='tournaments.tournamentmatch')),
+            ],
+            options={
+                'ordering': ['match', 'placement', 'id'],
+                'unique_together': {('match', 'entry')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:22
+
+from django.db import migrations, models
+
+
+def backfill_next_match_slot(apps, schema_editor):
+    """Existing brackets fed the lower match_number into slot 1"""
+    TournamentMatch = apps.get_model("tournaments", "TournamentMatch")
+    feeders = TournamentMatch.objects.filter(next_match__isnull=False).order_by("next_match_id", "match_number")
+    updated = []
+    previous_target = None
+    for match in feeders.iterator():
+        match.next_match_slot = 1 if match.next_match_id != previous_target else 2
+        previous_target = match.next_match_id
+        updated.append(match)
+    TournamentMatch.objects.bulk_update(updated, ["next_match_slot"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0007_tournament_heat_size_matchparticipant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournamentmatch',
+            name='next_match_slot',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 'Player 1'), (2, 'Player 2')], help_text='Slot the winner takes in next_match', null=True),
+        ),
+        migrations.RunPython(backfill_next_match_slot, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:23
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0008_tournamentmatch_next_match_slot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='auto_schedule',
+            field=models.BooleanField(default=False, help_text='Re-plan boards and start times whenever a result comes in'),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='match_duration_minutes',
+            field=models.IntegerField(default=20, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='min_rest_minutes',
+            field=models.IntegerField(default=10, help_text='Minimum break for a player between matches', validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='num_boards',
+            field=models.IntegerField(default=4, help_text='Boards available for simultaneous matches', validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AddField(
+            model_name='tournamentmatch',
+            name='board_number',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:26
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_confirmed_count(apps, schema_editor):
+    Tournament = apps.get_model("tournaments", "Tournament")
+    TournamentEntry = apps.get_model("tournaments", "TournamentEntry")
+    confirmed = (
+        TournamentEntry.objects.filter(tournament=OuterRef("pk"), status="CONFIRMED")
+        .order_by()
+        .values("tournament")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Tournament.objects.update(confirmed_count=Coalesce(Subquery(confirmed), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0009_tournament_auto_schedule_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='confirmed_count',
+            field=models.IntegerField(default=0, help_text='Confirmed entries, maintained by TournamentEntry.save'),
+        ),
+        migrations.RunPython(backfill_confirmed_count, migrations.RunPython.noop),
+    ]
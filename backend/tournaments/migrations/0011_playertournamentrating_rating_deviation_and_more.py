@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0010_tournament_confirmed_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playertournamentrating',
+            name='rating_deviation',
+            field=models.FloatField(default=350.0),
+        ),
+        migrations.AddField(
+            model_name='playertournamentrating',
+            name='volatility',
+            field=models.FloatField(default=0.06),
+        ),
+        migrations.AddField(
+            model_name='tournamentmatch',
+            name='rated_at',
+            field=models.DateTimeField(blank=True, help_text='When the result was applied to player ratings', null=True),
+        ),
+    ]
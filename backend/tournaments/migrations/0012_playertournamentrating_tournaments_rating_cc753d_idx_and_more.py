@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0011_playertournamentrating_rating_deviation_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='playertournamentrating',
+            index=models.Index(fields=['-rating', 'id'], name='tournaments_rating_cc753d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playertournamentrating',
+            index=models.Index(fields=['skill_tier', '-rating'], name='tournaments_skill_t_f52678_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0012_playertournamentrating_tournaments_rating_cc753d_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matchevent',
+            index=models.Index(fields=['match', 'id'], name='tournaments_match_i_3ef461_idx'),
+        ),
+    ]
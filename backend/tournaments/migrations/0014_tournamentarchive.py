@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0013_matchevent_tournaments_match_i_3ef461_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TournamentArchive',
+            fields=[
+                ('tournament', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive', serialize=False, to='tournaments.tournament')),
+                ('document', models.BinaryField(help_text='Detail, bracket and standings as compressed JSON')),
+                ('created_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
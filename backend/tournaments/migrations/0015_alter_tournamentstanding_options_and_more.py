@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0014_tournamentarchive'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='tournamentstanding',
+            options={'ordering': ['rank', '-tournament_points', '-points_difference', '-head_to_head_wins', '-buchholz_score', '-median_buchholz', '-sonneborn_berger', '-points_for']},
+        ),
+        migrations.AddField(
+            model_name='tournamentstanding',
+            name='median_buchholz',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Buchholz without the best and worst opponent', max_digits=6),
+        ),
+        migrations.AlterField(
+            model_name='tournamentstanding',
+            name='head_to_head_wins',
+            field=models.IntegerField(default=0, help_text='Wins against opponents tied on points and points difference'),
+        ),
+    ]
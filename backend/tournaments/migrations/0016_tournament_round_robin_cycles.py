@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:50
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0015_alter_tournamentstanding_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='round_robin_cycles',
+            field=models.IntegerField(default=1, help_text='Times each pair meets in a round robin (2 = home and away)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(2)]),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0002_alter_game_game_type'),
+        ('tournaments', '0016_tournament_round_robin_cycles'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tournamentmatch',
+            index=models.Index(fields=['round', 'status'], name='tournaments_round_i_293e6b_idx'),
+        ),
+    ]
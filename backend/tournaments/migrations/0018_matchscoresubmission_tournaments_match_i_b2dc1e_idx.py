@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0017_tournamentmatch_tournaments_round_i_293e6b_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matchscoresubmission',
+            index=models.Index(fields=['match', 'status'], name='tournaments_match_i_b2dc1e_idx'),
+        ),
+    ]
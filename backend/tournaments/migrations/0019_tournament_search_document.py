@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:59
+
+from django.db import migrations, models
+
+FTS_TABLE = "tournaments_tournament_fts"
+GIN_INDEX = "tournaments_tournament_search_gin"
+
+
+def fill_search_documents(apps, schema_editor):
+    Tournament = apps.get_model("tournaments", "Tournament")
+    tournaments = list(Tournament.objects.select_related("organizer"))
+    for tournament in tournaments:
+        organizer = tournament.organizer
+        tournament.search_document = " ".join(
+            filter(None, [tournament.name, tournament.description, organizer.public_username, organizer.email])
+        )
+    Tournament.objects.bulk_update(tournaments, ["search_document"], batch_size=500)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+
+        Tournament = apps.get_model("tournaments", "Tournament")
+        schema_editor.add_index(Tournament, GinIndex(SearchVector("search_document", config="simple"), name=GIN_INDEX))
+    elif schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(search_document, tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, search_document) SELECT id, search_document FROM tournaments_tournament"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+    elif schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0018_matchscoresubmission_tournaments_match_i_b2dc1e_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False, help_text='Name, description and organizer, maintained on save'),
+        ),
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
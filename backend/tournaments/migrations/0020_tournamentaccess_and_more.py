@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_tournament_access(apps, schema_editor):
+    Tournament = apps.get_model("tournaments", "Tournament")
+    TournamentAccess = apps.get_model("tournaments", "TournamentAccess")
+    TournamentEntry = apps.get_model("tournaments", "TournamentEntry")
+    TournamentInvitation = apps.get_model("tournaments", "TournamentInvitation")
+    private = Tournament.objects.filter(is_private=True)
+    rows = [
+        TournamentAccess(user_id=user_id, tournament_id=tournament_id, source=source)
+        for source, pairs in [
+            ("ORGANIZER", private.values_list("organizer_id", "pk")),
+            ("ENTRY", TournamentEntry.objects.filter(tournament__is_private=True).values_list("player_id", "tournament_id")),
+            ("INVITATION", TournamentInvitation.objects.filter(tournament__is_private=True).values_list("player_id", "tournament_id")),
+        ]
+        for user_id, tournament_id in pairs.iterator()
+    ]
+    TournamentAccess.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0019_tournament_search_document'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TournamentAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('ORGANIZER', 'Organizer'), ('ENTRY', 'Entry'), ('INVITATION', 'Invitation')], max_length=20)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['is_private', '-start_time'], name='tournaments_is_priv_1d5067_idx'),
+        ),
+        migrations.AddField(
+            model_name='tournamentaccess',
+            name='tournament',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access', to='tournaments.tournament'),
+        ),
+        migrations.AddField(
+            model_name='tournamentaccess',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tournament_access', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='tournamentaccess',
+            unique_together={('user', 'tournament', 'source')},
+        ),
+        migrations.RunPython(fill_tournament_access, migrations.RunPython.noop),
+    ]
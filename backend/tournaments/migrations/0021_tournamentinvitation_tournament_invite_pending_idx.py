@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0020_tournamentaccess_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tournamentinvitation',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['expires_at'], name='tournament_invite_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0021_tournamentinvitation_tournament_invite_pending_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tournamentstanding',
+            name='buchholz_score',
+            field=models.DecimalField(decimal_places=2, default=0, help_text="Sum of opponents' scores (for Swiss)", max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='tournamentstanding',
+            name='median_buchholz',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Buchholz without the best and worst opponent', max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='tournamentstanding',
+            name='sonneborn_berger',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Weighted opponent score', max_digits=10),
+        ),
+    ]
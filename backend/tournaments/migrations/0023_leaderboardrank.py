@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0022_alter_tournamentstanding_buchholz_score_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardRank',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tier', models.CharField(blank=True, max_length=20)),
+                ('rating', models.IntegerField()),
+                ('rank', models.PositiveIntegerField()),
+            ],
+            options={
+                'unique_together': {('tier', 'rating')},
+            },
+        ),
+    ]
@@ -1,8 +1,13 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
+class TournamentFull(Exception):
+    """Raised when an entry would confirm past ``max_participants``"""
+
+
 class Tournament(models.Model):
     """Main tournament model supporting multiple formats"""
     
@@ -44,7 +49,11 @@ class Tournament(models.Model):
     # Entry Management
     max_participants = models.IntegerField(default=32, validators=[MinValueValidator(2), MaxValueValidator(512)])
     min_participants = models.IntegerField(default=4, validators=[MinValueValidator(2)])
+    heat_size = models.IntegerField(default=4, validators=[MinValueValidator(2), MaxValueValidator(16)], help_text="Players per heat in free-for-all events")
+    ladder_challenge_range = models.IntegerField(default=3, validators=[MinValueValidator(1)], help_text="How many rungs above themselves a ladder player may challenge")
+    round_robin_cycles = models.IntegerField(default=1, validators=[MinValueValidator(1), MaxValueValidator(2)], help_text="Times each pair meets in a round robin (2 = home and away)")
     is_private = models.BooleanField(default=False, help_text="Private tournaments are hidden from public listing")
+    confirmed_count = models.IntegerField(default=0, help_text="Confirmed entries, maintained by TournamentEntry.save")
     allow_public_registration = models.BooleanField(default=True)
     require_approval = models.BooleanField(default=False)  # Organizer must approve entries
     registration_password = models.CharField(max_length=100, blank=True)  # Optional password protection
@@ -64,6 +73,12 @@ class Tournament(models.Model):
     start_time = models.DateTimeField()
     estimated_duration_hours = models.IntegerField(default=2)
     
+    # Scheduling
+    num_boards = models.IntegerField(default=4, validators=[MinValueValidator(1)], help_text="Boards available for simultaneous matches")
+    match_duration_minutes = models.IntegerField(default=20, validators=[MinValueValidator(1)])
+    min_rest_minutes = models.IntegerField(default=10, validators=[MinValueValidator(0)], help_text="Minimum break for a player between matches")
+    auto_schedule = models.BooleanField(default=False, help_text="Re-plan boards and start times whenever a result comes in")
+    
     # Status
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT)
     current_round = models.IntegerField(default=0)
@@ -82,6 +97,9 @@ class Tournament(models.Model):
     score_passcode = models.CharField(max_length=20, blank=True, help_text="Passcode for participants to submit scores")
     allow_score_submission = models.BooleanField(default=True, help_text="Allow participants to submit match scores")
     
+    # Full-text search (GIN expression index on PostgreSQL, FTS5 table on SQLite)
+    search_document = models.TextField(blank=True, editable=False, help_text="Name, description and organizer, maintained on save")
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -90,23 +108,85 @@ class Tournament(models.Model):
         indexes = [
             models.Index(fields=["status", "-start_time"]),
             models.Index(fields=["organizer", "-created_at"]),
+            models.Index(fields=["is_private", "-start_time"]),
         ]
     
+    # Counters maintained with F() updates; a full save of a stale instance must not overwrite them
+    DENORMALIZED_FIELDS = ("confirmed_count",)
+    
     def __str__(self):
         return f"{self.name} ({self.get_tournament_format_display()})"
     
+    # Fields that make up ``search_document``
+    SEARCH_FIELDS = ("name", "description", "organizer")
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or set(update_fields) & set(self.SEARCH_FIELDS):
+            self.search_document = self.build_search_document()
+            if update_fields is not None:
+                kwargs["update_fields"] = [*update_fields, "search_document"]
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        self._loaded_access = self.access_key
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_access = (loaded.get("is_private"), loaded.get("organizer_id"))
+        return instance
+    
+    @property
+    def access_key(self):
+        """Fields that decide who may see a private tournament (see ``TournamentAccess``)"""
+        return (self.is_private, self.organizer_id)
+    
+    def build_search_document(self):
+        organizer = self.organizer
+        return " ".join(filter(None, [self.name, self.description, organizer.public_username, organizer.email]))
+    
+    @classmethod
+    def reserve_spots(cls, tournament_id, count=1):
+        """Claim ``count`` confirmed spots with one conditional UPDATE.
+        
+        The capacity check, the increment and closing registration once the
+        last spot is taken happen in the same statement, so concurrent
+        registrations can never oversubscribe. Raises ``TournamentFull``.
+        """
+        reserved = cls.objects.filter(
+            pk=tournament_id,
+            confirmed_count__lte=F("max_participants") - count,
+        ).update(
+            confirmed_count=F("confirmed_count") + count,
+            status=Case(
+                When(
+                    status=cls.Status.REGISTRATION_OPEN,
+                    confirmed_count__gte=F("max_participants") - count,
+                    then=Value(cls.Status.REGISTRATION_CLOSED),
+                ),
+                default=F("status"),
+            ),
+        )
+        if not reserved:
+            raise TournamentFull("Tournament is full")
+    
     @property
     def is_registration_open(self):
         now = timezone.now()
         return (
             self.status == self.Status.REGISTRATION_OPEN
             and self.registration_start <= now <= self.registration_end
-            and self.entries.filter(status=TournamentEntry.Status.CONFIRMED).count() < self.max_participants
+            and self.confirmed_count < self.max_participants
         )
     
     @property
     def participant_count(self):
-        return self.entries.filter(status=TournamentEntry.Status.CONFIRMED).count()
+        return self.confirmed_count
     
     @property
     def spots_remaining(self):
@@ -143,6 +223,7 @@ class TournamentEntry(models.Model):
     # Seeding & Placement
     seed_number = models.IntegerField(null=True, blank=True)  # For seeded tournaments
     final_placement = models.IntegerField(null=True, blank=True)  # 1st, 2nd, 3rd, etc.
+    ladder_position = models.IntegerField(null=True, blank=True)  # 1 = top of the ladder
     
     # Stats
     wins = models.IntegerField(default=0)
@@ -161,9 +242,35 @@ class TournamentEntry(models.Model):
     class Meta:
         unique_together = ["tournament", "player"]
         ordering = ["seed_number", "-points", "-wins", "registered_at"]
+        indexes = [
+            models.Index(fields=["tournament", "ladder_position"]),
+        ]
     
     def __str__(self):
         return f"{self.player} in {self.tournament.name} ({self.get_status_display()})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = dict(zip(field_names, values)).get("status")
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """Save and keep ``Tournament.confirmed_count`` in step, in one transaction"""
+        update_fields = kwargs.get("update_fields")
+        delta = 0
+        if update_fields is None or "status" in update_fields:
+            was_confirmed = getattr(self, "_loaded_status", None) == self.Status.CONFIRMED
+            is_confirmed = self.status == self.Status.CONFIRMED
+            delta = int(is_confirmed) - int(was_confirmed)
+        
+        with transaction.atomic():
+            if delta > 0:
+                Tournament.reserve_spots(self.tournament_id)
+            elif delta < 0:
+                Tournament.objects.filter(pk=self.tournament_id).update(confirmed_count=F("confirmed_count") - 1)
+            super().save(*args, **kwargs)
+        self._loaded_status = self.status
 
 
 class TournamentRound(models.Model):
@@ -207,6 +314,7 @@ class TournamentMatch(models.Model):
     # Bracket position
     match_number = models.IntegerField()  # Position in bracket
     next_match = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="previous_matches")
+    next_match_slot = models.PositiveSmallIntegerField(null=True, blank=True, choices=[(1, "Player 1"), (2, "Player 2")], help_text="Slot the winner takes in next_match")
     
     # Results
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.SCHEDULED)
@@ -220,11 +328,16 @@ class TournamentMatch(models.Model):
     
     # Timing
     scheduled_time = models.DateTimeField(null=True, blank=True)
+    board_number = models.IntegerField(null=True, blank=True)
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    rated_at = models.DateTimeField(null=True, blank=True, help_text="When the result was applied to player ratings")
     
     class Meta:
         ordering = ["round__round_number", "match_number"]
+        indexes = [
+            models.Index(fields=["round", "status"]),
+        ]
     
     def __str__(self):
         p1 = self.player1_entry.player if self.player1_entry else "TBD"
@@ -232,6 +345,24 @@ class TournamentMatch(models.Model):
         return f"{self.tournament.name} - {p1} vs {p2}"
 
 
+class MatchParticipant(models.Model):
+    """Participant in a multi-player match (free-for-all heat)"""
+    
+    match = models.ForeignKey(TournamentMatch, on_delete=models.CASCADE, related_name="participants")
+    entry = models.ForeignKey(TournamentEntry, on_delete=models.CASCADE, related_name="heat_results")
+    
+    placement = models.IntegerField(null=True, blank=True)  # 1 = heat winner
+    score = models.IntegerField(default=0)
+    points = models.IntegerField(default=0, help_text="Placement points awarded for this heat")
+    
+    class Meta:
+        unique_together = ["match", "entry"]
+        ordering = ["match", "placement", "id"]
+    
+    def __str__(self):
+        return f"{self.entry.player} in {self.match}"
+
+
 class TournamentInvitation(models.Model):
     """Direct invitations to players (for invite-only tournaments)"""
     
@@ -255,6 +386,10 @@ class TournamentInvitation(models.Model):
     class Meta:
         unique_together = ["tournament", "player"]
         ordering = ["-created_at"]
+        indexes = [
+            # Only pending invitations can expire; keeps the sweeper off the rest of the table
+            models.Index(fields=["expires_at"], condition=models.Q(status="PENDING"), name="tournament_invite_pending_idx"),
+        ]
     
     def __str__(self):
         return f"Invitation: {self.player} to {self.tournament.name}"
@@ -270,6 +405,10 @@ class PlayerTournamentRating(models.Model):
     peak_rating = models.IntegerField(default=1500)
     lowest_rating = models.IntegerField(default=1500)
     
+    # Glicko-2 state (only moves when TOURNAMENT_RATING_SYSTEM is "glicko2")
+    rating_deviation = models.FloatField(default=350.0)
+    volatility = models.FloatField(default=0.06)
+    
     # Tournament Stats
     tournaments_played = models.IntegerField(default=0)
     tournaments_won = models.IntegerField(default=0)
@@ -301,6 +440,10 @@ class PlayerTournamentRating(models.Model):
     
     class Meta:
         ordering = ["-rating"]
+        indexes = [
+            models.Index(fields=["-rating", "id"]),
+            models.Index(fields=["skill_tier", "-rating"]),
+        ]
     
     def __str__(self):
         return f"{self.player.username} - Rating: {self.rating}"
@@ -343,6 +486,24 @@ class PlayerTournamentRating(models.Model):
         return rating_change
 
 
+class LeaderboardRank(models.Model):
+    """Dense rank of each distinct rating, overall (blank tier) and within each skill tier.
+    
+    Rebuilt periodically by ``Leaderboard.rebuild_ranks`` so a rank lookup is
+    one seek on ``(tier, rating)`` instead of counting the ratings above it.
+    """
+    
+    tier = models.CharField(max_length=20, blank=True)
+    rating = models.IntegerField()
+    rank = models.PositiveIntegerField()
+    
+    class Meta:
+        unique_together = ["tier", "rating"]
+    
+    def __str__(self):
+        return f"{self.tier or 'ALL'} {self.rating}: #{self.rank}"
+
+
 class TournamentStanding(models.Model):
     """Real-time standings/leaderboard for a tournament"""
     
@@ -371,11 +532,12 @@ class TournamentStanding(models.Model):
     highest_score = models.IntegerField(default=0)
     
     # Tiebreak Metrics (Buchholz, Sonneborn-Berger)
-    buchholz_score = models.DecimalField(max_digits=6, decimal_places=2, default=0, help_text="Sum of opponents' scores (for Swiss)")
-    sonneborn_berger = models.DecimalField(max_digits=6, decimal_places=2, default=0, help_text="Weighted opponent score")
+    buchholz_score = models.DecimalField(max_digits=10, decimal_places=2, default=0, help_text="Sum of opponents' scores (for Swiss)")
+    median_buchholz = models.DecimalField(max_digits=10, decimal_places=2, default=0, help_text="Buchholz without the best and worst opponent")
+    sonneborn_berger = models.DecimalField(max_digits=10, decimal_places=2, default=0, help_text="Weighted opponent score")
     
     # Head-to-head tiebreak
-    head_to_head_wins = models.IntegerField(default=0, help_text="Wins against tied opponents")
+    head_to_head_wins = models.IntegerField(default=0, help_text="Wins against opponents tied on points and points difference")
     
     # Meta
     last_updated = models.DateTimeField(auto_now=True)
@@ -386,7 +548,9 @@ class TournamentStanding(models.Model):
             "rank", 
             "-tournament_points", 
             "-points_difference",
+            "-head_to_head_wins",
             "-buchholz_score",
+            "-median_buchholz",
             "-sonneborn_berger",
             "-points_for"
         ]
@@ -497,6 +661,9 @@ class MatchScoreSubmission(models.Model):
     
     class Meta:
         ordering = ["-submitted_at"]
+        indexes = [
+            models.Index(fields=["match", "status"]),
+        ]
     
     def __str__(self):
         return f"Score submission for {self.match} by {self.submitted_by.username}"
@@ -523,7 +690,43 @@ class MatchEvent(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["match", "id"]),
+        ]
 
     def __str__(self):
         return f"{self.match} - {self.get_event_type_display()}"
 
+
+class TournamentArchive(models.Model):
+    """Pre-rendered final state of a completed tournament (zlib-compressed JSON)"""
+
+    tournament = models.OneToOneField(Tournament, on_delete=models.CASCADE, primary_key=True, related_name="archive")
+    document = models.BinaryField(help_text="Detail, bracket and standings as compressed JSON")
+    created_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Archive of {self.tournament}"
+
+
+class TournamentAccess(models.Model):
+    """Who may see a private tournament, one row per reason (maintained by signals).
+    
+    Public tournaments have no rows; visibility is the union of public
+    tournaments and the user's rows here.
+    """
+    
+    class Source(models.TextChoices):
+        ORGANIZER = "ORGANIZER", "Organizer"
+        ENTRY = "ENTRY", "Entry"
+        INVITATION = "INVITATION", "Invitation"
+    
+    user = models.ForeignKey("accounts.User", on_delete=models.CASCADE, related_name="tournament_access")
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name="access")
+    source = models.CharField(max_length=20, choices=Source.choices)
+    
+    class Meta:
+        unique_together = ["user", "tournament", "source"]
+    
+    def __str__(self):
+        return f"{self.user} sees {self.tournament} ({self.get_source_display()})"
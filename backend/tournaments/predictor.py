@@ -0,0 +1,185 @@
+"""Monte Carlo "chance to win" predictions for elimination brackets"""
+import hashlib
+
+import numpy as np
+from django.core.cache import cache
+
+from .caching import get_bracket_version
+from .models import Tournament, TournamentEntry, TournamentMatch
+from .ratings import RatingEngine
+
+
+class BracketPredictor:
+    """Simulate the rest of a single-elimination bracket from current ratings.
+
+    Every simulation is one row of a NumPy array; the only Python loop is
+    over rounds, each of which plays all of its matches for all simulations
+    at once. Match odds use the Elo expectation of the two players' current
+    ``PlayerTournamentRating``.
+    """
+
+    SIMULATIONS = 100_000
+    CHUNK_SIZE = 25_000  # Bounds memory to a few MB per array on 512-player brackets
+    CACHE_TIMEOUT = 60 * 60
+    FORMATS = [Tournament.Format.SINGLE_ELIMINATION]
+
+    @staticmethod
+    def load(tournament):
+        """Bracket arrays for ``simulate`` (one query for matches, one for ratings)"""
+        rows = list(
+            TournamentMatch.objects.filter(tournament=tournament, round__is_losers_bracket=False)
+            .order_by("round__round_number", "match_number")
+            .values_list("id", "round__round_number", "player1_entry_id", "player2_entry_id",
+                         "winner_entry_id", "next_match_id", "next_match_slot")
+        )
+        entries = list(
+            TournamentEntry.objects.filter(tournament=tournament, status=TournamentEntry.Status.CONFIRMED)
+            .order_by("pk")
+            .values_list("pk", "player__email", "player__tournament_rating__rating")
+        )
+        index_of = {entry_id: i for i, (entry_id, _, _) in enumerate(entries)}
+
+        def index(entry_id):
+            return index_of.get(entry_id, -1)
+
+        position = {}
+        rounds = []
+        for match_id, round_number, p1, p2, winner, _, _ in rows:
+            if not rounds or rounds[-1]["number"] != round_number:
+                rounds.append({"number": round_number, "ids": [], "p1": [], "p2": [], "winner": []})
+            current = rounds[-1]
+            position[match_id] = len(current["ids"])
+            current["ids"].append(match_id)
+            current["p1"].append(index(p1))
+            current["p2"].append(index(p2))
+            current["winner"].append(index(winner))
+
+        for current in rounds:
+            size = len(current["ids"])
+            current["feed1"] = np.full(size, -1)
+            current["feed2"] = np.full(size, -1)
+        round_of = {match_id: r for r, current in enumerate(rounds) for match_id in current["ids"]}
+        for match_id, _, _, _, _, next_id, slot in rows:
+            if next_id in round_of:
+                feeds = rounds[round_of[next_id]]["feed2" if slot == 2 else "feed1"]
+                feeds[position[next_id]] = position[match_id]
+
+        for current in rounds:
+            for key in ("p1", "p2", "winner"):
+                current[key] = np.array(current[key], dtype=np.int16)  # Brackets hold at most 512 entries
+
+        ratings = np.array(
+            [rating if rating is not None else RatingEngine.INITIAL_RATING for _, _, rating in entries], dtype=float
+        )
+        return entries, ratings, rounds
+
+    @staticmethod
+    def simulate(rounds, ratings, simulations=SIMULATIONS, rng=None):
+        """Play out ``simulations`` brackets.
+
+        ``rounds`` is the output of ``load``: per round, the fixed occupants
+        (``p1``/``p2``, -1 when still open), decided ``winner`` (-1 when not
+        played) and the feeder match positions in the previous round
+        (``feed1``/``feed2``). Returns ``reach`` of shape (entries, rounds),
+        the number of simulations in which each entry plays in each round,
+        and ``wins``, how often each entry won the final.
+        """
+        rng = rng or np.random.default_rng()
+        num_entries = len(ratings)
+        reach = np.zeros((num_entries, len(rounds)), dtype=np.int64)
+        wins = np.zeros(num_entries, dtype=np.int64)
+        # Ratings pre-scaled so Elo's 10 ** (diff / 400) becomes a float32 exp; -1 reads the padding
+        scaled = np.append(ratings * (np.log(10) / 400), 0.0).astype(np.float32)
+
+        for start in range(0, simulations, BracketPredictor.CHUNK_SIZE):
+            size = min(BracketPredictor.CHUNK_SIZE, simulations - start)
+            previous = None
+            for r, current in enumerate(rounds):
+                fixed1, fixed2 = current["p1"], current["p2"]
+                if previous is None:
+                    open1 = open2 = np.zeros(len(fixed1), dtype=bool)
+                else:
+                    open1 = (current["feed1"] >= 0) & (fixed1 < 0)
+                    open2 = (current["feed2"] >= 0) & (fixed2 < 0)
+
+                if not open1.any() and not open2.any():
+                    # Every pairing is known (e.g. the first round): odds per match, not per simulation
+                    p1, p2 = fixed1[np.newaxis, :], fixed2[np.newaxis, :]
+                    for slots in (fixed1, fixed2):
+                        reach[:, r] += size * np.bincount(slots + 1, minlength=num_entries + 1)[1:]
+                else:
+                    p1 = np.broadcast_to(fixed1, (size, len(fixed1))).copy()
+                    p2 = np.broadcast_to(fixed2, (size, len(fixed2))).copy()
+                    p1[:, open1] = previous[:, current["feed1"][open1]]
+                    p2[:, open2] = previous[:, current["feed2"][open2]]
+                    # Shift by one so empty slots (-1) land in bin 0 and are dropped
+                    for slots in (p1, p2):
+                        reach[:, r] += np.bincount(slots.ravel() + 1, minlength=num_entries + 1)[1:]
+
+                expected = 1 / (1 + np.exp(scaled[p2] - scaled[p1]))
+                winner = np.where(rng.random((size, len(fixed1)), dtype=np.float32) < expected, p1, p2)
+                if p1.min(initial=0) < 0 or p2.min(initial=0) < 0:
+                    winner = np.where(p2 < 0, p1, np.where(p1 < 0, p2, winner))
+                decided = current["winner"] >= 0
+                winner[:, decided] = current["winner"][decided]
+                previous = winner
+
+            if previous is not None and previous.shape[1]:
+                wins += np.bincount(previous[:, -1] + 1, minlength=num_entries + 1)[1:]
+
+        return reach, wins
+
+    @staticmethod
+    def fingerprint(entries, rounds, ratings):
+        """Changes only when an entry, occupant, result or rating changes"""
+        digest = hashlib.sha1(np.array([entry_id for entry_id, _, _ in entries], dtype=np.int64).tobytes())
+        digest.update(ratings.tobytes())
+        for current in rounds:
+            for key in ("p1", "p2", "winner"):
+                digest.update(current[key].tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def predict(tournament, simulations=SIMULATIONS):
+        """Per-entry chance of reaching each round and winning, cached.
+
+        The bracket version is checked first; when it moved (any match or
+        entry change) the bracket is reloaded but only re-simulated if a
+        result, occupant or rating actually changed.
+        """
+        if tournament.tournament_format not in BracketPredictor.FORMATS:
+            raise ValueError("Predictions are only available for single elimination brackets")
+
+        version_key = f"tournament:{tournament.pk}:prediction:v{get_bracket_version(tournament.pk)}:{simulations}"
+        document = cache.get(version_key)
+        if document is not None:
+            return document
+
+        entries, ratings, rounds = BracketPredictor.load(tournament)
+        fingerprint = BracketPredictor.fingerprint(entries, rounds, ratings)
+        result_key = f"tournament:{tournament.pk}:prediction:{fingerprint}:{simulations}"
+        document = cache.get(result_key)
+        if document is None:
+            reach, wins = BracketPredictor.simulate(rounds, ratings, simulations)
+            round_numbers = [current["number"] for current in rounds]
+            document = {
+                "tournament": tournament.pk,
+                "simulations": simulations,
+                "rounds": round_numbers,
+                "entries": sorted(
+                    [
+                        {
+                            "entry": entry_id,
+                            "name": name,
+                            "rating": int(ratings[i]),
+                            "reach": {str(number): round(float(reach[i, r]) / simulations, 4) for r, number in enumerate(round_numbers)},
+                            "win": round(float(wins[i]) / simulations, 4),
+                        }
+                        for i, (entry_id, name, _) in enumerate(entries)
+                    ],
+                    key=lambda row: (-row["win"], row["entry"]),
+                ),
+            }
+            cache.set(result_key, document, BracketPredictor.CACHE_TIMEOUT)
+        cache.set(version_key, document, BracketPredictor.CACHE_TIMEOUT)
+        return document
@@ -0,0 +1,362 @@
+"""Player rating pipeline: Elo or Glicko-2 over completed tournament matches"""
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .caching import bump_leaderboard_version
+from .models import PlayerTournamentRating, TournamentEntry, TournamentMatch
+
+
+class RatingEngine:
+    """Apply match results to ``PlayerTournamentRating``.
+
+    Results are applied one at a time as they are verified (``apply_match``)
+    and the whole history can be replayed from scratch (``recompute``). Both
+    paths share ``replay``, which processes matches in slices of games that
+    share no player; within a slice every update is independent, so each
+    slice is a handful of vectorized NumPy operations and the outcome is the
+    same as applying the games one by one in chronological order.
+    """
+
+    ELO = "elo"
+    GLICKO2 = "glicko2"
+    SYSTEMS = [ELO, GLICKO2]
+
+    K_FACTOR = 32
+    INITIAL_RATING = 1500.0
+    INITIAL_DEVIATION = 350.0
+    INITIAL_VOLATILITY = 0.06
+    GLICKO2_TAU = 0.5  # Constrains volatility change (Glickman suggests 0.3 - 1.2)
+    GLICKO2_SCALE = 173.7178
+    GLICKO2_EPSILON = 1e-6
+
+    # Lower bound of each tier, see ``PlayerTournamentRating.update_skill_tier``
+    TIER_FLOORS = [1400, 1600, 1800, 2000, 2200, 2400]
+    TIERS = ["BRONZE", "SILVER", "GOLD", "PLATINUM", "DIAMOND", "MASTER", "GRANDMASTER"]
+
+    RATING_FIELDS = [
+        "rating", "peak_rating", "lowest_rating", "rating_deviation", "volatility",
+        "total_matches_won", "total_matches_lost", "skill_tier", "updated_at",
+    ]
+
+    @staticmethod
+    def system():
+        system = getattr(settings, "TOURNAMENT_RATING_SYSTEM", RatingEngine.ELO)
+        if system not in RatingEngine.SYSTEMS:
+            raise ValueError(f"Unknown rating system {system!r}")
+        return system
+
+    # Pure array code
+
+    @staticmethod
+    def slices(p1, p2, num_players):
+        """Group match indices so no player appears twice in a group.
+
+        Each match goes one level after the latest earlier match of either
+        player, which keeps every player's games in order while letting
+        unrelated games share a slice.
+        """
+        last = [0] * num_players
+        levels = np.empty(len(p1), dtype=np.int64)
+        for i, (a, b) in enumerate(zip(p1.tolist(), p2.tolist())):
+            level = max(last[a], last[b]) + 1
+            last[a] = last[b] = level
+            levels[i] = level
+        order = np.argsort(levels, kind="stable")
+        return np.split(order, np.flatnonzero(np.diff(levels[order])) + 1) if len(order) else []
+
+    @staticmethod
+    def elo_update(rating_a, rating_b, score_a):
+        """Truncated K-factor change for side A (side B moves by the opposite)"""
+        expected = 1 / (1 + 10 ** ((rating_b - rating_a) / 400))
+        return np.trunc(RatingEngine.K_FACTOR * (score_a - expected))
+
+    @staticmethod
+    def glicko2_update(mu, phi, sigma, opp_mu, opp_phi, score):
+        """One-game Glicko-2 rating period on the internal scale (arrays in, arrays out)"""
+        g = 1 / np.sqrt(1 + 3 * opp_phi ** 2 / np.pi ** 2)
+        expected = 1 / (1 + np.exp(-g * (mu - opp_mu)))
+        v = 1 / (g ** 2 * expected * (1 - expected))
+        delta = v * g * (score - expected)
+
+        new_sigma = RatingEngine._glicko2_volatility(phi, sigma, v, delta)
+        phi_star = np.sqrt(phi ** 2 + new_sigma ** 2)
+        new_phi = 1 / np.sqrt(1 / phi_star ** 2 + 1 / v)
+        new_mu = mu + new_phi ** 2 * g * (score - expected)
+        return new_mu, new_phi, new_sigma
+
+    @staticmethod
+    def _glicko2_volatility(phi, sigma, v, delta):
+        """Illinois root finding for the new volatility, run on all players at once"""
+        tau = RatingEngine.GLICKO2_TAU
+        a = np.log(sigma ** 2)
+        spread = delta ** 2 - phi ** 2 - v
+
+        def f(x):
+            ex = np.exp(x)
+            return ex * (spread - ex) / (2 * (phi ** 2 + v + ex) ** 2) - (x - a) / tau ** 2
+
+        big = spread > 0
+        A = a.copy()
+        B = np.where(big, np.log(np.where(big, spread, 1.0)), a - tau)
+        bracketing = ~big & (f(B) < 0)
+        k = 1
+        while bracketing.any():
+            k += 1
+            B = np.where(bracketing, a - k * tau, B)
+            bracketing &= f(B) < 0
+
+        fA, fB = f(A), f(B)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(100):
+                active = np.abs(B - A) > RatingEngine.GLICKO2_EPSILON
+                if not active.any():
+                    break
+                C = A + (A - B) * fA / (fB - fA)
+                fC = f(C)
+                flip = active & (fC * fB < 0)
+                A = np.where(flip, B, A)
+                fA = np.where(flip, fB, np.where(active, fA / 2, fA))
+                B = np.where(active, C, B)
+                fB = np.where(active, fC, fB)
+        return np.exp(A / 2)
+
+    @staticmethod
+    def replay(p1, p2, score, num_players, system=ELO, initial=None):
+        """Replay matches in chronological order.
+
+        ``p1``/``p2`` are player indices in ``[0, num_players)`` and ``score``
+        is 1.0 where player 1 won, 0.0 where player 2 won. ``initial`` may
+        hold starting ``rating``, ``deviation``, ``volatility``, ``peak`` and
+        ``lowest`` arrays; players default to a fresh rating. Returns the
+        final arrays plus the per-match changes ``change1``/``change2``.
+        """
+        initial = initial or {}
+        rating = np.array(initial.get("rating", np.full(num_players, RatingEngine.INITIAL_RATING)), dtype=float)
+        deviation = np.array(initial.get("deviation", np.full(num_players, RatingEngine.INITIAL_DEVIATION)), dtype=float)
+        volatility = np.array(initial.get("volatility", np.full(num_players, RatingEngine.INITIAL_VOLATILITY)), dtype=float)
+        peak = np.array(initial.get("peak", rating), dtype=float)
+        lowest = np.array(initial.get("lowest", rating), dtype=float)
+        change1 = np.zeros(len(p1))
+        change2 = np.zeros(len(p1))
+        scale = RatingEngine.GLICKO2_SCALE
+
+        for idx in RatingEngine.slices(p1, p2, num_players):
+            a, b, s = p1[idx], p2[idx], score[idx]
+            before_a, before_b = rating[a], rating[b]
+
+            if system == RatingEngine.GLICKO2:
+                # Both sides of every game in one pass; opponents are the mirrored halves
+                players = np.concatenate([a, b])
+                opponents = np.concatenate([b, a])
+                new_mu, new_phi, new_sigma = RatingEngine.glicko2_update(
+                    (rating[players] - RatingEngine.INITIAL_RATING) / scale,
+                    deviation[players] / scale,
+                    volatility[players],
+                    (rating[opponents] - RatingEngine.INITIAL_RATING) / scale,
+                    deviation[opponents] / scale,
+                    np.concatenate([s, 1 - s]),
+                )
+                rating[players] = new_mu * scale + RatingEngine.INITIAL_RATING
+                deviation[players] = new_phi * scale
+                volatility[players] = new_sigma
+            else:
+                change = RatingEngine.elo_update(before_a, before_b, s)
+                rating[a] = before_a + change
+                rating[b] = before_b - change
+
+            change1[idx] = rating[a] - before_a
+            change2[idx] = rating[b] - before_b
+            for side in (a, b):
+                peak[side] = np.maximum(peak[side], rating[side])
+                lowest[side] = np.minimum(lowest[side], rating[side])
+
+        return {
+            "rating": rating,
+            "deviation": deviation,
+            "volatility": volatility,
+            "peak": peak,
+            "lowest": lowest,
+            "change1": change1,
+            "change2": change2,
+        }
+
+    @staticmethod
+    def skill_tiers(ratings):
+        return [RatingEngine.TIERS[i] for i in np.searchsorted(RatingEngine.TIER_FLOORS, ratings, side="right")]
+
+    # Database paths
+
+    @staticmethod
+    def rateable_matches():
+        """Completed head-to-head matches with a winner (byes and walkovers are not rated)"""
+        return TournamentMatch.objects.filter(
+            status=TournamentMatch.Status.COMPLETED,
+            player1_entry__isnull=False,
+            player2_entry__isnull=False,
+            winner_entry__isnull=False,
+        )
+
+    @staticmethod
+    def apply_match(match, previous_winner_id=None):
+        """Apply one verified result to both players' ratings.
+
+        ``rated_at`` is claimed with a conditional UPDATE first, so a result
+        is counted once even if it is reported twice concurrently. When an
+        override changes the winner of a match that was already rated
+        (``previous_winner_id``), the old change cannot be taken back on its
+        own because later games were rated from it, so the whole history is
+        replayed with ``recompute`` once the transaction commits.
+        """
+        if not (match.player1_entry_id and match.player2_entry_id and match.winner_entry_id):
+            return False
+        if previous_winner_id is not None and previous_winner_id != match.winner_entry_id:
+            if TournamentMatch.objects.filter(pk=match.pk, rated_at__isnull=False).exists():
+                transaction.on_commit(RatingEngine.queue_recompute)
+                return False
+        system = RatingEngine.system()
+
+        with transaction.atomic():
+            claimed = TournamentMatch.objects.filter(pk=match.pk, rated_at__isnull=True).update(rated_at=timezone.now())
+            if not claimed:
+                return False
+
+            player_of = dict(
+                TournamentEntry.objects.filter(pk__in=[match.player1_entry_id, match.player2_entry_id])
+                .values_list("pk", "player_id")
+            )
+            players = [player_of[match.player1_entry_id], player_of[match.player2_entry_id]]
+            PlayerTournamentRating.objects.bulk_create(
+                [PlayerTournamentRating(player_id=player_id) for player_id in players], ignore_conflicts=True
+            )
+            locked = {
+                r.player_id: r
+                for r in PlayerTournamentRating.objects.select_for_update().filter(player_id__in=players).order_by("player_id")
+            }
+            rows = [locked[player_id] for player_id in players]
+
+            won = match.winner_entry_id == match.player1_entry_id
+            result = RatingEngine.replay(
+                np.array([0]), np.array([1]), np.array([1.0 if won else 0.0]), 2, system,
+                initial={
+                    "rating": [r.rating for r in rows],
+                    "deviation": [r.rating_deviation for r in rows],
+                    "volatility": [r.volatility for r in rows],
+                    "peak": [r.peak_rating for r in rows],
+                    "lowest": [r.lowest_rating for r in rows],
+                },
+            )
+
+            changes = {}
+            for i, (row, entry_id) in enumerate(zip(rows, [match.player1_entry_id, match.player2_entry_id])):
+                new_rating = int(round(result["rating"][i]))
+                changes[entry_id] = new_rating - row.rating
+                row.rating = new_rating
+                row.peak_rating = max(row.peak_rating, new_rating)
+                row.lowest_rating = min(row.lowest_rating, new_rating)
+                row.rating_deviation = float(result["deviation"][i])
+                row.volatility = float(result["volatility"][i])
+                if (i == 0) == won:
+                    row.total_matches_won += 1
+                else:
+                    row.total_matches_lost += 1
+                row.skill_tier = RatingEngine.skill_tiers([new_rating])[0]
+                row.updated_at = timezone.now()
+            PlayerTournamentRating.objects.bulk_update(rows, RatingEngine.RATING_FIELDS)
+
+            for entry_id, change in changes.items():
+                if change:
+                    TournamentEntry.objects.filter(pk=entry_id).update(rating_change=F("rating_change") + change)
+            bump_leaderboard_version()
+        return True
+
+    @staticmethod
+    def queue_recompute():
+        from .tasks import recompute_ratings  # The task module imports the bracket code, which imports this one
+
+        recompute_ratings.delay()
+
+    @staticmethod
+    def recompute(system=None):
+        """Rebuild every rating and ``TournamentEntry.rating_change`` from match history"""
+        system = system or RatingEngine.system()
+        now = timezone.now()
+
+        with transaction.atomic():
+            matches = RatingEngine.rateable_matches().order_by("completed_at", "id")
+            rows = np.array(
+                list(matches.values_list(
+                    "player1_entry_id", "player1_entry__player_id",
+                    "player2_entry_id", "player2_entry__player_id",
+                    "winner_entry_id",
+                )),
+                dtype=np.int64,
+            ).reshape(-1, 5)
+            last_completed = matches.values_list("completed_at", flat=True).last()
+
+            players, inverse = np.unique(rows[:, [1, 3]], return_inverse=True)
+            inverse = inverse.reshape(-1, 2)
+            p1, p2 = inverse[:, 0], inverse[:, 1]
+            score = (rows[:, 4] == rows[:, 0]).astype(float)
+            result = RatingEngine.replay(p1, p2, score, len(players), system)
+
+            wins = np.bincount(np.where(score == 1, p1, p2), minlength=len(players))
+            losses = np.bincount(np.where(score == 1, p2, p1), minlength=len(players))
+            ratings = np.rint(result["rating"]).astype(np.int64)
+            peaks = np.rint(result["peak"]).astype(np.int64)
+            lowests = np.rint(result["lowest"]).astype(np.int64)
+            tiers = RatingEngine.skill_tiers(ratings)
+            index_of = {int(player_id): i for i, player_id in enumerate(players)}
+
+            existing = {r.player_id: r for r in PlayerTournamentRating.objects.all()}
+            PlayerTournamentRating.objects.bulk_create(
+                [PlayerTournamentRating(player_id=player_id) for player_id in index_of if player_id not in existing],
+                batch_size=1000,
+            )
+            existing = {r.player_id: r for r in PlayerTournamentRating.objects.all()}
+
+            for player_id, row in existing.items():
+                i = index_of.get(player_id)
+                if i is None:
+                    rating = int(RatingEngine.INITIAL_RATING)
+                    row.rating = row.peak_rating = row.lowest_rating = rating
+                    row.rating_deviation = RatingEngine.INITIAL_DEVIATION
+                    row.volatility = RatingEngine.INITIAL_VOLATILITY
+                    row.total_matches_won = row.total_matches_lost = 0
+                    row.skill_tier = RatingEngine.skill_tiers([rating])[0]
+                else:
+                    row.rating = int(ratings[i])
+                    row.peak_rating = int(peaks[i])
+                    row.lowest_rating = int(lowests[i])
+                    row.rating_deviation = float(result["deviation"][i])
+                    row.volatility = float(result["volatility"][i])
+                    row.total_matches_won = int(wins[i])
+                    row.total_matches_lost = int(losses[i])
+                    row.skill_tier = tiers[i]
+                row.updated_at = now
+            PlayerTournamentRating.objects.bulk_update(existing.values(), RatingEngine.RATING_FIELDS, batch_size=1000)
+
+            # Per-tournament change is the sum of the entry's match changes
+            entry_ids, entry_index = np.unique(rows[:, [0, 2]], return_inverse=True)
+            entry_changes = np.bincount(
+                entry_index.reshape(-1), weights=np.column_stack([result["change1"], result["change2"]]).reshape(-1),
+                minlength=len(entry_ids),
+            )
+            TournamentEntry.objects.exclude(rating_change=0).update(rating_change=0)
+            TournamentEntry.objects.bulk_update(
+                [
+                    TournamentEntry(pk=int(entry_id), rating_change=int(round(change)))
+                    for entry_id, change in zip(entry_ids, entry_changes)
+                    if round(change)
+                ],
+                ["rating_change"],
+                batch_size=1000,
+            )
+
+            if last_completed is not None:
+                matches.filter(rated_at__isnull=True, completed_at__lte=last_completed).update(rated_at=now)
+            bump_leaderboard_version()
+
+        return {"system": system, "matches": len(rows), "players": len(players)}
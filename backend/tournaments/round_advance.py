@@ -0,0 +1,87 @@
+"""Close finished rounds and open the next one without organizer input"""
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .bracket_generator import BracketGenerator
+from .models import Tournament, TournamentMatch, TournamentRound
+from .tiebreaks import TiebreakEngine
+
+
+class RoundAdvancer:
+    """Advance ``Tournament.current_round`` as rounds finish.
+
+    Runs (as a Celery task) after every match completion. A round counts as
+    finished when none of its matches is still open, which is one aggregate
+    over the ``(round, status)`` index. Only the current round advances:
+    round robin rounds that finish early are closed when the current round
+    catches up to them. Swiss rounds are paired from the standings at that
+    point; the tournament completes once no round has open matches.
+    """
+
+    FORMATS = [
+        Tournament.Format.SINGLE_ELIMINATION,
+        Tournament.Format.ROUND_ROBIN,
+        Tournament.Format.SWISS,
+    ]
+    DONE = [TournamentMatch.Status.COMPLETED, TournamentMatch.Status.WALKOVER, TournamentMatch.Status.CANCELLED]
+
+    @staticmethod
+    def round_finished(round_id):
+        """True when the round has matches and all of them are decided"""
+        counts = TournamentMatch.objects.filter(round_id=round_id).aggregate(
+            total=Count("pk"),
+            open=Count("pk", filter=~Q(status__in=RoundAdvancer.DONE)),
+        )
+        return counts["total"] > 0 and counts["open"] == 0
+
+    @staticmethod
+    def advance(tournament_id, round_id):
+        """Close ``round_id`` if it is finished; returns the new current round or ``None``"""
+        if not RoundAdvancer.round_finished(round_id):
+            return None
+
+        with transaction.atomic():
+            # Concurrent completions of the last two matches race here; the row lock serialises them
+            tournament = Tournament.objects.select_for_update().get(pk=tournament_id)
+            current = TournamentRound.objects.get(pk=round_id)
+            if (
+                tournament.status != Tournament.Status.IN_PROGRESS
+                or tournament.tournament_format not in RoundAdvancer.FORMATS
+                or current.is_losers_bracket
+                or current.completed_at is not None
+            ):
+                return None
+
+            if current.round_number != tournament.current_round:
+                # Round robin rounds can finish out of order; they are closed once the current round catches up
+                return None
+
+            now = timezone.now()
+            rounds = TournamentRound.objects.filter(tournament=tournament, is_losers_bracket=False)
+            current.completed_at = now
+            current.save(update_fields=["completed_at"])
+
+            upcoming = rounds.filter(round_number__gt=current.round_number).order_by("round_number").first()
+            while upcoming is not None and RoundAdvancer.round_finished(upcoming.pk):
+                upcoming.completed_at = now
+                upcoming.save(update_fields=["completed_at"])
+                upcoming = rounds.filter(round_number__gt=upcoming.round_number).order_by("round_number").first()
+
+            if upcoming is None:
+                if TournamentMatch.objects.filter(
+                    tournament=tournament, round__is_losers_bracket=False
+                ).exclude(status__in=RoundAdvancer.DONE).exists():
+                    return None
+                tournament.status = Tournament.Status.COMPLETED
+                tournament.save(update_fields=["status", "updated_at"])
+                return None
+
+            if tournament.tournament_format == Tournament.Format.SWISS and not upcoming.matches.exists():
+                TiebreakEngine.apply(tournament)
+                BracketGenerator.generate_swiss_round_pairings(tournament, upcoming.round_number)
+            upcoming.started_at = now
+            upcoming.save(update_fields=["started_at"])
+            tournament.current_round = upcoming.round_number
+            tournament.save(update_fields=["current_round", "updated_at"])
+            return upcoming.round_number
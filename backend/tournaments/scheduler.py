@@ -0,0 +1,186 @@
+"""Board and time-slot scheduling for tournament matches"""
+import heapq
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .caching import bump_bracket_version
+from .models import MatchParticipant, Tournament, TournamentMatch
+
+
+class MatchScheduler:
+    """Assign every open match a board and a start time"""
+
+    DONE_STATUSES = [TournamentMatch.Status.COMPLETED, TournamentMatch.Status.WALKOVER]
+
+    @staticmethod
+    def plan(jobs, successors, num_boards, duration, rest, fixed_ends=None, board_free=None):
+        """Critical-path list scheduling.
+
+        ``jobs`` lists the match ids to place, in tie-break order.
+        ``successors`` maps an id to the ids that must wait for it (bracket
+        feeds via ``next_match`` and each player's following match).
+        ``fixed_ends`` maps already started or finished ids to their end time
+        and ``board_free`` maps a board to the time it becomes free. All times
+        are minutes from the scheduling origin.
+
+        Whenever a board frees up it takes the released match with the
+        longest remaining chain to the end of the event, so the critical path
+        (the road to the final) is never left waiting behind matches with
+        slack. Returns ``{id: (board, start_minute)}``.
+        """
+        fixed_ends = fixed_ends or {}
+        board_free = board_free or {}
+        order = {job: i for i, job in enumerate(jobs)}
+        indegree = dict.fromkeys(jobs, 0)
+        ready_at = dict.fromkeys(jobs, 0.0)
+
+        for job in jobs:
+            for succ in successors.get(job, ()):
+                if succ in indegree:
+                    indegree[succ] += 1
+        for job, end in fixed_ends.items():
+            for succ in successors.get(job, ()):
+                if succ in ready_at:
+                    ready_at[succ] = max(ready_at[succ], end + rest)
+
+        # Longest chain (in minutes) from each job to the end of the event
+        remaining = dict(indegree)
+        topo = [job for job in jobs if remaining[job] == 0]
+        for job in topo:
+            for succ in successors.get(job, ()):
+                if succ in remaining:
+                    remaining[succ] -= 1
+                    if remaining[succ] == 0:
+                        topo.append(succ)
+        priority = {}
+        for job in reversed(topo):
+            tail = max((rest + priority[s] for s in successors.get(job, ()) if s in priority), default=0.0)
+            priority[job] = duration + tail
+
+        boards = [(board_free.get(board, 0.0), board) for board in range(1, num_boards + 1)]
+        heapq.heapify(boards)
+        waiting = [(ready_at[job], -priority[job], order[job], job) for job in jobs if indegree[job] == 0]
+        heapq.heapify(waiting)
+        released = []
+
+        result = {}
+        while waiting or released:
+            free_at, board = heapq.heappop(boards)
+            if not released and waiting[0][0] > free_at:
+                free_at = waiting[0][0]  # Board idles until the next match can start
+            while waiting and waiting[0][0] <= free_at:
+                _, neg_priority, position, job = heapq.heappop(waiting)
+                heapq.heappush(released, (neg_priority, position, job))
+
+            _, _, job = heapq.heappop(released)
+            # A job released while another board idled forward may be ready later than this board is free
+            start = max(free_at, ready_at[job])
+            end = start + duration
+            result[job] = (board, start)
+            heapq.heappush(boards, (end, board))
+
+            for succ in successors.get(job, ()):
+                if succ in indegree:
+                    ready_at[succ] = max(ready_at[succ], end + rest)
+                    indegree[succ] -= 1
+                    if indegree[succ] == 0:
+                        heapq.heappush(waiting, (ready_at[succ], -priority[succ], order[succ], succ))
+
+        return result
+
+    @staticmethod
+    def schedule(tournament, now=None):
+        """(Re)plan every match that has not started yet.
+
+        Finished and in-progress matches are kept where they are and their
+        actual times feed the plan, so calling this after a result that came
+        in early or late pulls the remaining schedule forward or pushes it
+        back. Only rows whose board or start time changed are written.
+        """
+        now = now or timezone.now()
+        if now <= tournament.start_time:
+            origin = tournament.start_time
+        else:
+            # Whole minutes keep repeated re-plans within a minute from rewriting every row
+            origin = now.replace(second=0, microsecond=0)
+            if origin < now:
+                origin += timedelta(minutes=1)
+        duration = tournament.match_duration_minutes
+        rest = tournament.min_rest_minutes
+
+        def minutes(moment):
+            return (moment - origin).total_seconds() / 60
+
+        matches = list(
+            TournamentMatch.objects.filter(tournament=tournament, round__is_losers_bracket=False)
+            .exclude(status=TournamentMatch.Status.CANCELLED)
+            .order_by("round__round_number", "match_number")
+            .only("id", "next_match", "player1_entry", "player2_entry", "status",
+                  "board_number", "scheduled_time", "started_at", "completed_at")
+        )
+
+        # Free-for-all heats seat their players in MatchParticipant, not the two entry slots
+        heat_entries = defaultdict(list)
+        if tournament.tournament_format == Tournament.Format.FREE_FOR_ALL:
+            heats = MatchParticipant.objects.filter(match__tournament=tournament).values_list("match_id", "entry_id")
+            for match_id, entry_id in heats:
+                heat_entries[match_id].append(entry_id)
+
+        successors = defaultdict(list)
+        last_match_of = {}
+        jobs = []
+        fixed_ends = {}
+        board_free = {}
+        for match in matches:
+            if match.next_match_id:
+                successors[match.id].append(match.next_match_id)
+            for entry_id in (match.player1_entry_id, match.player2_entry_id, *heat_entries[match.id]):
+                if entry_id:
+                    if entry_id in last_match_of:
+                        successors[last_match_of[entry_id]].append(match.id)
+                    last_match_of[entry_id] = match.id
+
+            if match.status in MatchScheduler.DONE_STATUSES:
+                fixed_ends[match.id] = minutes(match.completed_at) if match.completed_at else 0.0
+            elif match.status == TournamentMatch.Status.IN_PROGRESS:
+                started = match.started_at or match.scheduled_time or now
+                end = max(minutes(started) + duration, minutes(now))
+                fixed_ends[match.id] = end
+                if match.board_number:
+                    board_free[match.board_number] = max(board_free.get(match.board_number, 0.0), end)
+            else:
+                jobs.append(match.id)
+
+        plan = MatchScheduler.plan(jobs, successors, tournament.num_boards, duration, rest, fixed_ends, board_free)
+
+        by_id = {match.id: match for match in matches}
+        changed = []
+        for match_id, (board, start) in plan.items():
+            match = by_id[match_id]
+            scheduled_time = origin + timedelta(minutes=start)
+            if match.board_number != board or match.scheduled_time != scheduled_time:
+                match.board_number = board
+                match.scheduled_time = scheduled_time
+                changed.append(match)
+        if changed:
+            TournamentMatch.objects.bulk_update(changed, ["board_number", "scheduled_time"], batch_size=500)
+            bump_bracket_version(tournament.pk)
+
+        last_end = max(
+            [start + duration for _, start in plan.values()] + list(fixed_ends.values()),
+            default=0.0,
+        )
+        estimated_end = origin + timedelta(minutes=last_end)
+        hours = max(1, math.ceil((estimated_end - tournament.start_time).total_seconds() / 3600))
+        Tournament.objects.filter(pk=tournament.pk).update(estimated_duration_hours=hours)
+        tournament.estimated_duration_hours = hours
+
+        return {
+            "scheduled": len(plan),
+            "updated": len(changed),
+            "boards": tournament.num_boards,
+            "estimated_end": estimated_end,
+        }
@@ -0,0 +1,140 @@
+"""Ranked full-text tournament search with keyset pagination"""
+import base64
+import json
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Tournament
+
+
+class TournamentSearch:
+    """Match ``Tournament.search_document`` against a query through a text index.
+
+    PostgreSQL uses a GIN index on ``to_tsvector('simple', search_document)``
+    and ``ts_rank``; SQLite uses the ``tournaments_tournament_fts`` FTS5
+    table (kept in step by signals) and ``bm25``. Every query term is a
+    prefix match and all terms must match. Results are ordered by rank,
+    then id, and paged with a ``(rank, id)`` cursor instead of OFFSET.
+    """
+
+    CONFIG = "simple"
+    FTS_TABLE = "tournaments_tournament_fts"
+    MAX_TERMS = 8
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+    BATCH_SIZE = 500
+
+    TERM = re.compile(r"\w+")
+
+    @staticmethod
+    def terms(text):
+        return TournamentSearch.TERM.findall((text or "").lower())[: TournamentSearch.MAX_TERMS]
+
+    @staticmethod
+    def uses_postgres():
+        return connection.vendor == "postgresql"
+
+    # Index maintenance (SQLite only; the PostgreSQL index is on an expression)
+
+    @staticmethod
+    def index(tournament):
+        if TournamentSearch.uses_postgres():
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TournamentSearch.FTS_TABLE} WHERE rowid = %s", [tournament.pk])
+            cursor.execute(
+                f"INSERT INTO {TournamentSearch.FTS_TABLE} (rowid, search_document) VALUES (%s, %s)",
+                [tournament.pk, tournament.search_document],
+            )
+
+    @staticmethod
+    def index_many(tournaments):
+        if TournamentSearch.uses_postgres() or not tournaments:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {TournamentSearch.FTS_TABLE} WHERE rowid = %s", [[t.pk] for t in tournaments]
+            )
+            cursor.executemany(
+                f"INSERT INTO {TournamentSearch.FTS_TABLE} (rowid, search_document) VALUES (%s, %s)",
+                [[t.pk, t.search_document] for t in tournaments],
+            )
+
+    @staticmethod
+    def refresh_organizer(user):
+        """Rebuild the documents of every tournament ``user`` organizes after their name or email changed.
+
+        ``bulk_update`` skips the ``Tournament`` save signals, so only the
+        documents and the text index are rewritten: no archives, access
+        rows or cache versions.
+        """
+        tournaments = list(Tournament.objects.filter(organizer=user).only("pk", "name", "description", "organizer_id"))
+        for tournament in tournaments:
+            tournament.organizer = user
+            tournament.search_document = tournament.build_search_document()
+        Tournament.objects.bulk_update(tournaments, ["search_document"], batch_size=TournamentSearch.BATCH_SIZE)
+        TournamentSearch.index_many(tournaments)
+
+    @staticmethod
+    def unindex(tournament_id):
+        if TournamentSearch.uses_postgres():
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TournamentSearch.FTS_TABLE} WHERE rowid = %s", [tournament_id])
+
+    # Querying
+
+    @staticmethod
+    def match(queryset, terms):
+        """Filter ``queryset`` to documents matching every term and annotate ``rank`` (higher is better)"""
+        if not terms:
+            return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+
+        if TournamentSearch.uses_postgres():
+            from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+            query = SearchQuery(" & ".join(f"{term}:*" for term in terms), search_type="raw", config=TournamentSearch.CONFIG)
+            return (
+                queryset.annotate(document=SearchVector("search_document", config=TournamentSearch.CONFIG))
+                .filter(document=query)
+                .annotate(rank=SearchRank(F("document"), query))
+            )
+
+        table = TournamentSearch.FTS_TABLE
+        expression = " ".join(f'"{term}"*' for term in terms)
+        matched = RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [expression])
+        rank = RawSQL(
+            f"SELECT -bm25({table}) FROM {table} WHERE {table} MATCH %s AND rowid = {queryset.model._meta.db_table}.id",
+            [expression],
+            output_field=FloatField(),
+        )
+        return queryset.filter(pk__in=matched).annotate(rank=rank)
+
+    @staticmethod
+    def encode_cursor(rank, pk):
+        return base64.urlsafe_b64encode(json.dumps([rank, pk]).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """``(rank, id)`` from a cursor; raises ``ValueError`` when malformed"""
+        try:
+            rank, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return float(rank), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError) as exc:
+            raise ValueError("Invalid cursor") from exc
+
+    @staticmethod
+    def page(queryset, limit=DEFAULT_LIMIT, cursor=None):
+        """One page of a ranked queryset and the cursor of the next page (or ``None``)"""
+        if cursor is not None:
+            rank, pk = cursor
+            queryset = queryset.filter(Q(rank__lt=rank) | Q(rank=rank, pk__gt=pk))
+        rows = list(queryset.order_by("-rank", "pk")[: limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = TournamentSearch.encode_cursor(rows[-1].rank, rows[-1].pk)
+        return rows, next_cursor
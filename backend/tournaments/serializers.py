@@ -1,15 +1,20 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from .models import (
     Tournament,
     TournamentEntry,
     TournamentRound,
     TournamentMatch,
+    MatchParticipant,
     TournamentInvitation,
     PlayerTournamentRating,
     TournamentStanding,
     MatchScoreSubmission,
 )
+from .entry_import import EntryImporter
+from .search import TournamentSearch
+from .verification import SubmissionVerifier
 
 User = get_user_model()
 
@@ -30,6 +35,7 @@ class TournamentEntrySerializer(serializers.ModelSerializer):
             "status",
             "seed_number",
             "final_placement",
+            "ladder_position",
             "wins",
             "losses",
             "points",
@@ -39,7 +45,7 @@ class TournamentEntrySerializer(serializers.ModelSerializer):
             "registered_at",
             "approved_at",
         ]
-        read_only_fields = ["id", "wins", "losses", "points", "tournament_points_earned", 
+        read_only_fields = ["id", "ladder_position", "wins", "losses", "points", "tournament_points_earned", 
                            "rating_change", "total_score", "registered_at", "approved_at"]
 
 
@@ -69,12 +75,58 @@ class TournamentMatchSerializer(serializers.ModelSerializer):
             "player2_score",
             "game",
             "scheduled_time",
+            "board_number",
             "started_at",
             "completed_at",
         ]
         read_only_fields = ["id", "started_at", "completed_at"]
 
 
+class MatchParticipantSerializer(serializers.ModelSerializer):
+    """Serializer for free-for-all heat participants"""
+    player_name = serializers.CharField(source="entry.player.email", read_only=True)
+    
+    class Meta:
+        model = MatchParticipant
+        fields = ["id", "entry", "player_name", "placement", "score", "points"]
+        read_only_fields = fields
+
+
+class HeatSerializer(serializers.ModelSerializer):
+    """Serializer for a free-for-all heat with its participants"""
+    round_number = serializers.IntegerField(source="round.round_number", read_only=True)
+    participants = MatchParticipantSerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = TournamentMatch
+        fields = [
+            "id",
+            "round",
+            "round_number",
+            "match_number",
+            "status",
+            "winner_entry",
+            "participants",
+            "scheduled_time",
+            "board_number",
+            "completed_at",
+        ]
+        read_only_fields = fields
+
+
+class HeatPlacementSerializer(serializers.Serializer):
+    """One participant's result in a heat"""
+    entry_id = serializers.IntegerField()
+    placement = serializers.IntegerField(min_value=1)
+    score = serializers.IntegerField(min_value=0, default=0)
+
+
+class HeatResultSerializer(serializers.Serializer):
+    """Serializer for submitting a free-for-all heat result"""
+    match_id = serializers.IntegerField()
+    results = HeatPlacementSerializer(many=True, allow_empty=False)
+
+
 class TournamentRoundSerializer(serializers.ModelSerializer):
     """Serializer for tournament rounds"""
     matches = TournamentMatchSerializer(many=True, read_only=True)
@@ -148,6 +200,9 @@ class TournamentDetailSerializer(serializers.ModelSerializer):
             "game_settings",
             "max_participants",
             "min_participants",
+            "heat_size",
+            "ladder_challenge_range",
+            "round_robin_cycles",
             "allow_public_registration",
             "require_approval",
             "registration_password",
@@ -156,6 +211,10 @@ class TournamentDetailSerializer(serializers.ModelSerializer):
             "registration_end",
             "start_time",
             "estimated_duration_hours",
+            "num_boards",
+            "match_duration_minutes",
+            "min_rest_minutes",
+            "auto_schedule",
             "status",
             "current_round",
             "prize_pool",
@@ -174,6 +233,24 @@ class TournamentDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "organizer", "status", "current_round", "created_at", "updated_at"]
 
 
+class TournamentSearchSerializer(serializers.Serializer):
+    """Query parameters of tournament search (``status`` is handled like the list endpoint)"""
+    q = serializers.CharField(required=False, allow_blank=True, max_length=200)
+    tournament_format = serializers.ChoiceField(choices=Tournament.Format.choices, required=False)
+    game_mode = serializers.ChoiceField(choices=Tournament.GameMode.choices, required=False)
+    start_after = serializers.DateTimeField(required=False)
+    start_before = serializers.DateTimeField(required=False)
+    min_spots = serializers.IntegerField(required=False, min_value=1)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=TournamentSearch.MAX_LIMIT, default=TournamentSearch.DEFAULT_LIMIT)
+    cursor = serializers.CharField(required=False)
+
+    def validate_cursor(self, value):
+        try:
+            return TournamentSearch.decode_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid cursor")
+
+
 class TournamentCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating tournaments"""
     
@@ -187,6 +264,9 @@ class TournamentCreateSerializer(serializers.ModelSerializer):
             "game_settings",
             "max_participants",
             "min_participants",
+            "heat_size",
+            "ladder_challenge_range",
+            "round_robin_cycles",
             "allow_public_registration",
             "require_approval",
             "registration_password",
@@ -195,6 +275,10 @@ class TournamentCreateSerializer(serializers.ModelSerializer):
             "registration_end",
             "start_time",
             "estimated_duration_hours",
+            "num_boards",
+            "match_duration_minutes",
+            "min_rest_minutes",
+            "auto_schedule",
             "prize_pool",
             "prize_description",
             "winner_xp_reward",
@@ -245,15 +329,76 @@ class TournamentInvitationSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "invited_by", "created_at", "responded_at"]
 
 
+class BatchVerifySerializer(serializers.Serializer):
+    """Serializer for verifying many submissions: by ID, or all pending in a round"""
+    submission_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        max_length=SubmissionVerifier.MAX_BATCH
+    )
+    tournament = serializers.IntegerField(required=False)
+    round = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        if attrs.get("submission_ids"):
+            return attrs
+        if attrs.get("tournament") is None or attrs.get("round") is None:
+            raise serializers.ValidationError("Provide submission_ids, or tournament and round")
+        return attrs
+
+
 class BatchEntrySerializer(serializers.Serializer):
-    """Serializer for batch adding players"""
+    """Serializer for batch adding players by ID, email or CSV roster"""
+    MAX_PLAYERS = 10000
+
     player_ids = serializers.ListField(
         child=serializers.IntegerField(),
-        min_length=1,
-        max_length=100
+        required=False,
+        max_length=MAX_PLAYERS
+    )
+    emails = serializers.ListField(
+        child=serializers.EmailField(),
+        required=False,
+        max_length=MAX_PLAYERS
     )
+    csv_file = serializers.FileField(required=False)
     auto_approve = serializers.BooleanField(default=False)
 
+    def validate(self, attrs):
+        player_ids = list(attrs.get("player_ids", []))
+        emails = list(attrs.get("emails", []))
+
+        csv_file = attrs.pop("csv_file", None)
+        if csv_file is not None:
+            try:
+                text = csv_file.read().decode("utf-8-sig")
+            except UnicodeDecodeError:
+                raise serializers.ValidationError({"csv_file": "CSV file must be UTF-8 encoded"})
+            csv_ids, csv_emails = EntryImporter.parse_csv(text)
+            player_ids += csv_ids
+            emails += csv_emails
+
+        if not player_ids and not emails:
+            raise serializers.ValidationError("Provide player_ids, emails or a csv_file")
+        if len(player_ids) + len(emails) > self.MAX_PLAYERS:
+            raise serializers.ValidationError(f"At most {self.MAX_PLAYERS} players can be added at once")
+
+        attrs["player_ids"] = player_ids
+        attrs["emails"] = emails
+        return attrs
+
+
+class BulkInvitationSerializer(BatchEntrySerializer):
+    """Serializer for inviting players by ID, email or CSV roster"""
+    auto_approve = None
+    message = serializers.CharField(required=False, allow_blank=True, default="")
+    expires_at = serializers.DateTimeField(required=False)
+
+    def validate_expires_at(self, value):
+        if value <= timezone.now():
+            raise serializers.ValidationError("Expiry must be in the future")
+        return value
+
 
 class PlayerTournamentRatingSerializer(serializers.ModelSerializer):
     """Serializer for player tournament ratings"""
@@ -269,6 +414,7 @@ class PlayerTournamentRatingSerializer(serializers.ModelSerializer):
             "rating",
             "peak_rating",
             "lowest_rating",
+            "rating_deviation",
             "tournaments_played",
             "tournaments_won",
             "tournaments_runner_up",
@@ -280,7 +426,26 @@ class PlayerTournamentRatingSerializer(serializers.ModelSerializer):
             "skill_tier",
             "last_tournament_date",
         ]
-        read_only_fields = ["id", "player", "peak_rating", "lowest_rating"]
+        read_only_fields = ["id", "player", "peak_rating", "lowest_rating", "rating_deviation"]
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    """Compact leaderboard row; ``rank`` is annotated by the leaderboard query"""
+    player_name = serializers.CharField(source="player.email", read_only=True)
+    rank = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = PlayerTournamentRating
+        fields = [
+            "rank",
+            "player",
+            "player_name",
+            "rating",
+            "peak_rating",
+            "skill_tier",
+            "total_matches_won",
+            "total_matches_lost",
+        ]
 
 
 class TournamentStandingSerializer(serializers.ModelSerializer):
@@ -308,6 +473,10 @@ class TournamentStandingSerializer(serializers.ModelSerializer):
             "tournament_points",
             "average_score",
             "highest_score",
+            "head_to_head_wins",
+            "buchholz_score",
+            "median_buchholz",
+            "sonneborn_berger",
             "win_rate",
             "last_updated",
         ]
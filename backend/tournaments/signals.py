@@ -1,20 +1,130 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.contrib.auth import get_user_model
 from django.dispatch import receiver
-from .models import Tournament, TournamentEntry
+from .access import TournamentAccessIndex
+from .archive import TournamentArchiver
+from .caching import bump_bracket_version, bump_list_version, publish_match_event
+from .live import LiveScoreboard
+from .models import MatchEvent, Tournament, TournamentAccess, TournamentEntry, TournamentInvitation, TournamentMatch, TournamentRound
+from .round_advance import RoundAdvancer
+from .search import TournamentSearch
+from .tasks import advance_round
 
+User = get_user_model()
 
+
+@receiver(post_delete, sender=TournamentEntry)
+def release_confirmed_spot(sender, instance, **kwargs):
+    """Deleted confirmed entries (including cascades) free their spot"""
+    if instance.status == TournamentEntry.Status.CONFIRMED:
+        Tournament.objects.filter(pk=instance.tournament_id).update(confirmed_count=F("confirmed_count") - 1)
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_delete, sender=Tournament)
+def invalidate_tournament_bracket(sender, instance, **kwargs):
+    """Tournament status and round are part of the cached bracket"""
+    bump_bracket_version(instance.pk)
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_delete, sender=Tournament)
 @receiver(post_save, sender=TournamentEntry)
-def update_tournament_status(sender, instance, created, **kwargs):
-    """Auto-update tournament status when capacity is reached"""
-    if not created:
+@receiver(post_delete, sender=TournamentEntry)
+def invalidate_tournament_lists(sender, instance, **kwargs):
+    """Tournament fields, spot counts and private access all show in cached lists"""
+    bump_list_version()
+
+
+@receiver(post_save, sender=Tournament)
+def rebuild_tournament_access(sender, instance, created, **kwargs):
+    """Privacy or organizer changes recompute who may see the tournament"""
+    if created and not instance.is_private:
+        return
+    if getattr(instance, "_loaded_access", None) != instance.access_key:
+        TournamentAccessIndex.rebuild(instance)
+
+
+@receiver(post_save, sender=TournamentEntry)
+def grant_entry_access(sender, instance, created, **kwargs):
+    if created:
+        TournamentAccessIndex.grant(instance.tournament_id, [instance.player_id], TournamentAccess.Source.ENTRY)
+
+
+@receiver(post_delete, sender=TournamentEntry)
+def revoke_entry_access(sender, instance, **kwargs):
+    TournamentAccessIndex.revoke(instance.tournament_id, instance.player_id, TournamentAccess.Source.ENTRY)
+
+
+@receiver(post_save, sender=TournamentInvitation)
+def grant_invitation_access(sender, instance, created, **kwargs):
+    if created:
+        TournamentAccessIndex.grant(instance.tournament_id, [instance.player_id], TournamentAccess.Source.INVITATION)
+        bump_list_version()
+
+
+@receiver(post_delete, sender=TournamentInvitation)
+def revoke_invitation_access(sender, instance, **kwargs):
+    TournamentAccessIndex.revoke(instance.tournament_id, instance.player_id, TournamentAccess.Source.INVITATION)
+    bump_list_version()
+
+
+@receiver(post_save, sender=Tournament)
+def archive_completed_tournament(sender, instance, **kwargs):
+    """Freeze the final state once the tournament is saved as completed"""
+    if instance.status == Tournament.Status.COMPLETED:
+        transaction.on_commit(lambda: TournamentArchiver.archive(instance))
+
+
+@receiver(post_save, sender=Tournament)
+def index_tournament_search(sender, instance, update_fields=None, **kwargs):
+    """Keep the SQLite full-text table in step with ``search_document``"""
+    if update_fields is None or "search_document" in update_fields:
+        TournamentSearch.index(instance)
+
+
+@receiver(post_delete, sender=Tournament)
+def unindex_tournament_search(sender, instance, **kwargs):
+    TournamentSearch.unindex(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def refresh_organizer_search(sender, instance, created, update_fields=None, **kwargs):
+    """Organizer name and email are part of their tournaments' search documents"""
+    if created or getattr(instance, "_loaded_identity", None) == instance.search_identity:
         return
-    
-    tournament = instance.tournament
-    
-    if tournament.status == Tournament.Status.REGISTRATION_OPEN:
-        confirmed_count = tournament.entries.filter(status=TournamentEntry.Status.CONFIRMED).count()
-        
-        # Auto-close registration when full
-        if confirmed_count >= tournament.max_participants:
-            tournament.status = Tournament.Status.REGISTRATION_CLOSED
-            tournament.save()
+    TournamentSearch.refresh_organizer(instance)
+
+
+@receiver(post_save, sender=TournamentEntry)
+@receiver(post_delete, sender=TournamentEntry)
+@receiver(post_save, sender=TournamentRound)
+@receiver(post_delete, sender=TournamentRound)
+@receiver(post_save, sender=TournamentMatch)
+@receiver(post_delete, sender=TournamentMatch)
+def invalidate_bracket(sender, instance, **kwargs):
+    """Any entry, round or match change invalidates the cached bracket"""
+    bump_bracket_version(instance.tournament_id)
+
+
+@receiver(post_save, sender=MatchEvent)
+def announce_match_event(sender, instance, created, **kwargs):
+    """Wake up long-polling readers of the match feed"""
+    if created:
+        publish_match_event(instance.match_id, instance.pk)
+
+
+@receiver(post_save, sender=TournamentMatch)
+def push_live_match(sender, instance, **kwargs):
+    """Score, status and advancement changes go out on the live scoreboard"""
+    state = LiveScoreboard.match_state(instance)
+    transaction.on_commit(lambda: LiveScoreboard.publish_match(instance.tournament_id, state))
+
+
+@receiver(post_save, sender=TournamentMatch)
+def queue_round_advance(sender, instance, **kwargs):
+    """A decided match may finish its round; the worker checks and advances"""
+    if instance.status in RoundAdvancer.DONE:
+        transaction.on_commit(lambda: advance_round.delay(instance.tournament_id, instance.round_id))
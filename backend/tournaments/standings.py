@@ -0,0 +1,76 @@
+"""Incremental standings counters and set-based rank assignment"""
+from django.db import transaction
+from django.db.models import F, FloatField, Value, Window
+from django.db.models.functions import Cast, DenseRank, Greatest
+from django.utils import timezone
+
+from .models import TournamentStanding
+
+
+class StandingsEngine:
+    """Keep ``TournamentStanding`` rows current after each result"""
+
+    # Tiebreak order (same as ``TournamentStanding.Meta.ordering`` after rank)
+    RANK_ORDER = [
+        F("tournament_points").desc(),
+        F("points_difference").desc(),
+        F("head_to_head_wins").desc(),
+        F("buchholz_score").desc(),
+        F("median_buchholz").desc(),
+        F("sonneborn_berger").desc(),
+        F("points_for").desc(),
+    ]
+
+    WIN_POINTS = 3
+    DRAW_POINTS = 1
+
+    @staticmethod
+    def record_result(tournament, match, winner):
+        """Add one result to both players' counters.
+
+        Each side is a single UPDATE built from ``F()`` expressions, so the
+        counters never go through Python and concurrent results add up.
+        """
+        sides = [
+            (match.player1_entry_id, match.player1_score or 0, match.player2_score or 0),
+            (match.player2_entry_id, match.player2_score or 0, match.player1_score or 0),
+        ]
+        sides = [side for side in sides if side[0]]
+        winner_id = winner.pk if winner else None
+
+        with transaction.atomic():
+            TournamentStanding.objects.bulk_create(
+                [TournamentStanding(tournament=tournament, entry_id=entry_id, rank=0) for entry_id, _, _ in sides],
+                ignore_conflicts=True,
+            )
+            for entry_id, scored, conceded in sides:
+                changes = {
+                    "matches_played": F("matches_played") + 1,
+                    "points_for": F("points_for") + scored,
+                    "points_against": F("points_against") + conceded,
+                    "points_difference": F("points_difference") + (scored - conceded),
+                    "average_score": Cast(F("points_for") + scored, FloatField()) / (F("matches_played") + 1),
+                    "highest_score": Greatest(F("highest_score"), Value(scored)),
+                    "last_updated": timezone.now(),
+                }
+                if winner_id is None:
+                    changes["matches_drawn"] = F("matches_drawn") + 1
+                    changes["tournament_points"] = F("tournament_points") + StandingsEngine.DRAW_POINTS
+                elif winner_id == entry_id:
+                    changes["matches_won"] = F("matches_won") + 1
+                    changes["tournament_points"] = F("tournament_points") + StandingsEngine.WIN_POINTS
+                else:
+                    changes["matches_lost"] = F("matches_lost") + 1
+                TournamentStanding.objects.filter(tournament=tournament, entry_id=entry_id).update(**changes)
+
+    @staticmethod
+    def rerank(tournament):
+        """Assign ``DENSE_RANK()`` over the tiebreak order; only changed rows are written"""
+        ranked = (
+            TournamentStanding.objects.filter(tournament=tournament)
+            .annotate(new_rank=Window(DenseRank(), order_by=StandingsEngine.RANK_ORDER))
+            .values_list("pk", "rank", "new_rank")
+        )
+        changed = [TournamentStanding(pk=pk, rank=new_rank) for pk, rank, new_rank in ranked if rank != new_rank]
+        TournamentStanding.objects.bulk_update(changed, ["rank"], batch_size=500)
+        return len(changed)
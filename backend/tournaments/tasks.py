@@ -0,0 +1,30 @@
+from celery import shared_task
+
+from .invitations import InvitationService
+from .leaderboard import Leaderboard
+from .ratings import RatingEngine
+from .round_advance import RoundAdvancer
+
+
+@shared_task(ignore_result=True)
+def advance_round(tournament_id, round_id):
+    """Close a finished round and open the next one"""
+    return RoundAdvancer.advance(tournament_id, round_id)
+
+
+@shared_task(ignore_result=True)
+def expire_invitations():
+    """Periodic sweep of past-due pending invitations (see ``CELERY_BEAT_SCHEDULE``)"""
+    return InvitationService.expire_due()
+
+
+@shared_task(ignore_result=True)
+def rebuild_leaderboard_ranks():
+    """Periodic rebuild of the rating rank table behind "my rank" lookups"""
+    return Leaderboard.rebuild_ranks()
+
+
+@shared_task(ignore_result=True)
+def recompute_ratings():
+    """Replay the rating history after a rated result was overridden"""
+    RatingEngine.recompute()
@@ -0,0 +1,139 @@
+"""Standings and tiebreaks rebuilt from a tournament's results matrix"""
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+
+from .models import Tournament, TournamentEntry, TournamentMatch, TournamentStanding
+from .standings import StandingsEngine
+
+
+class TiebreakEngine:
+    """Recompute every standing and tiebreak of a league-style tournament.
+
+    Completed matches are loaded once and laid out as a results matrix in
+    coordinate form: one row per (player, opponent) pairing with the game
+    result (1, 0.5 or 0) and the legs scored and conceded. Each statistic
+    is then a ``bincount`` or ``ufunc.at`` over those rows, so the whole
+    table costs O(matches) no matter how many tiebreaks are involved.
+    """
+
+    FORMATS = [Tournament.Format.ROUND_ROBIN, Tournament.Format.SWISS]
+
+    COUNTER_FIELDS = [
+        "matches_played", "matches_won", "matches_lost", "matches_drawn", "points_for", "points_against",
+        "points_difference", "tournament_points", "highest_score", "head_to_head_wins",
+    ]
+    DECIMAL_FIELDS = ["average_score", "buchholz_score", "median_buchholz", "sonneborn_berger"]
+
+    @staticmethod
+    def load(tournament):
+        """Entry IDs and per-match index arrays (two queries)"""
+        matches = np.array(
+            TournamentMatch.objects.filter(
+                tournament=tournament,
+                status=TournamentMatch.Status.COMPLETED,
+                player1_entry__isnull=False,
+                player2_entry__isnull=False,
+            ).values_list("player1_entry_id", "player2_entry_id", "player1_score", "player2_score", "winner_entry_id"),
+            dtype=float,  # Missing scores / draws (NULL) arrive as NaN
+        ).reshape(-1, 5)
+        confirmed = TournamentEntry.objects.filter(
+            tournament=tournament, status=TournamentEntry.Status.CONFIRMED
+        ).values_list("pk", flat=True)
+        entry_ids = np.union1d(np.fromiter(confirmed, dtype=np.int64), matches[:, :2].astype(np.int64).ravel())
+
+        p1 = np.searchsorted(entry_ids, matches[:, 0].astype(np.int64))
+        p2 = np.searchsorted(entry_ids, matches[:, 1].astype(np.int64))
+        result = np.where(matches[:, 4] == matches[:, 0], 1.0, np.where(matches[:, 4] == matches[:, 1], 0.0, 0.5))
+        scores = np.nan_to_num(matches[:, 2:4]).astype(np.int64)
+        return entry_ids, p1, p2, scores[:, 0], scores[:, 1], result
+
+    @staticmethod
+    def compute(num_entries, p1, p2, score1, score2, result):
+        """Every standings column as an array indexed like the entries.
+
+        ``result`` is player 1's game score (1 win, 0.5 draw, 0 loss).
+        Head-to-head counts wins against opponents level on tournament
+        points and points difference, the two keys ranked above it.
+        """
+        # Both sides of every match: row player, opponent, result and legs from the row player's view
+        player = np.concatenate([p1, p2])
+        opponent = np.concatenate([p2, p1])
+        outcome = np.concatenate([result, 1 - result])
+        scored = np.concatenate([score1, score2])
+        conceded = np.concatenate([score2, score1])
+
+        def total(weights=None):
+            return np.bincount(player, weights=weights, minlength=num_entries)
+
+        played = total().astype(np.int64)
+        won = total(outcome == 1).astype(np.int64)
+        drawn = total(outcome == 0.5).astype(np.int64)
+        points_for = total(scored).astype(np.int64)
+        points_against = total(conceded).astype(np.int64)
+        points = StandingsEngine.WIN_POINTS * won + StandingsEngine.DRAW_POINTS * drawn
+        difference = points_for - points_against
+
+        highest = np.zeros(num_entries, dtype=np.int64)
+        np.maximum.at(highest, player, scored)
+
+        opponent_points = points[opponent].astype(float)
+        buchholz = total(opponent_points)
+        best = np.zeros(num_entries)
+        worst = np.full(num_entries, np.inf)
+        np.maximum.at(best, player, opponent_points)
+        np.minimum.at(worst, player, opponent_points)
+        # Cutting the best and worst opponent only makes sense with at least three
+        cut = played >= 3
+        median = buchholz.copy()
+        median[cut] -= best[cut] + worst[cut]
+
+        level = (points[player] == points[opponent]) & (difference[player] == difference[opponent])
+        head_to_head = total((outcome == 1) & level).astype(np.int64)
+
+        return {
+            "matches_played": played,
+            "matches_won": won,
+            "matches_lost": played - won - drawn,
+            "matches_drawn": drawn,
+            "points_for": points_for,
+            "points_against": points_against,
+            "points_difference": difference,
+            "tournament_points": points,
+            "highest_score": highest,
+            "head_to_head_wins": head_to_head,
+            "average_score": np.divide(points_for, played, out=np.zeros(num_entries), where=played > 0),
+            "buchholz_score": buchholz,
+            "median_buchholz": median,
+            "sonneborn_berger": total(outcome * opponent_points),
+        }
+
+    @staticmethod
+    def apply(tournament):
+        """Rewrite the standings from scratch and re-rank; returns the rows written"""
+        entry_ids, p1, p2, score1, score2, result = TiebreakEngine.load(tournament)
+        columns = TiebreakEngine.compute(len(entry_ids), p1, p2, score1, score2, result)
+        fields = TiebreakEngine.COUNTER_FIELDS + TiebreakEngine.DECIMAL_FIELDS
+        rows = {
+            entry_id: tuple(int(columns[field][i]) for field in TiebreakEngine.COUNTER_FIELDS)
+            + tuple(Decimal(f"{columns[field][i]:.2f}") for field in TiebreakEngine.DECIMAL_FIELDS)
+            for i, entry_id in enumerate(entry_ids.tolist())
+        }
+
+        with transaction.atomic():
+            TournamentStanding.objects.bulk_create(
+                [TournamentStanding(tournament=tournament, entry_id=entry_id, rank=0) for entry_id in rows],
+                ignore_conflicts=True,
+                batch_size=500,
+            )
+            changed = []
+            for pk, entry_id, *current in TournamentStanding.objects.filter(tournament=tournament).values_list(
+                "pk", "entry_id", *fields
+            ):
+                values = rows.get(entry_id)
+                if values is not None and tuple(current) != values:
+                    changed.append(TournamentStanding(pk=pk, **dict(zip(fields, values))))
+            TournamentStanding.objects.bulk_update(changed, fields, batch_size=500)
+            StandingsEngine.rerank(tournament)
+        return len(changed)
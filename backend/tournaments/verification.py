@@ -0,0 +1,100 @@
+"""Verification of participant score submissions, singly or in bulk"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .bracket_generator import BracketGenerator
+from .models import MatchScoreSubmission, TournamentMatch
+from .scheduler import MatchScheduler
+from .standings import StandingsEngine
+from .tiebreaks import TiebreakEngine
+
+
+class SubmissionVerifier:
+    """Apply pending score submissions to their matches in one transaction.
+
+    Every affected match is locked by a single ``select_for_update`` and
+    winners are advanced in bracket order, earlier rounds first. The locked
+    copy of a next match in the same batch is re-read after a winner moves
+    into it, so it is checked with its filled slot, not as it was locked.
+    Standings are then re-ranked (league formats: rebuilt with their
+    tiebreaks) and matches rescheduled once per tournament at the end
+    instead of once per result.
+    """
+
+    MAX_BATCH = 500
+
+    # Reasons a submission is left pending
+    ALREADY_COMPLETED = "already_completed"
+    INVALID_WINNER = "invalid_winner"
+    CONFLICT = "conflicting_submissions"
+
+    @staticmethod
+    def pending(queryset):
+        """Pending submissions with what verification reads, in bracket order"""
+        return (
+            queryset.filter(status=MatchScoreSubmission.Status.PENDING)
+            .select_related("match__tournament", "match__round", "winner")
+            .order_by("match__round__round_number", "match__match_number", "pk")
+        )
+
+    @staticmethod
+    def verify(submissions, user):
+        """Verify ``submissions`` (from ``pending``) on behalf of ``user``.
+
+        Several submissions for the same match are verified together when
+        they agree on the result and all left pending when they do not.
+        Returns the verified submission IDs and the skipped ones with a reason.
+        """
+        by_match = defaultdict(list)
+        for submission in submissions:
+            by_match[submission.match_id].append(submission)
+
+        verified, skipped = [], []
+        tournaments = {}
+        with transaction.atomic():
+            locked = {
+                match.pk: match
+                for match in TournamentMatch.objects.select_for_update().filter(pk__in=by_match).order_by("pk")
+            }
+            for match_id, group in by_match.items():
+                first = group[0]
+                match = locked[match_id]
+                match.tournament = first.match.tournament
+                reason = None
+                if len({(s.player1_score, s.player2_score, s.winner_id) for s in group}) > 1:
+                    reason = SubmissionVerifier.CONFLICT
+                elif match.status == TournamentMatch.Status.COMPLETED:
+                    reason = SubmissionVerifier.ALREADY_COMPLETED
+                elif first.winner_id is None or first.winner_id not in (match.player1_entry_id, match.player2_entry_id):
+                    reason = SubmissionVerifier.INVALID_WINNER
+                if reason:
+                    skipped += [{"id": s.pk, "reason": reason} for s in group]
+                    continue
+
+                match.player1_score = first.player1_score
+                match.player2_score = first.player2_score
+                BracketGenerator.advance_winner(match, first.winner, reschedule=False)
+                if match.next_match_id in locked:
+                    locked[match.next_match_id].refresh_from_db(fields=["player1_entry", "player2_entry"])
+                if match.tournament.tournament_format not in TiebreakEngine.FORMATS:
+                    StandingsEngine.record_result(match.tournament, match, first.winner)
+                tournaments[match.tournament_id] = match.tournament
+                verified += [s.pk for s in group]
+
+            MatchScoreSubmission.objects.filter(pk__in=verified).update(
+                status=MatchScoreSubmission.Status.VERIFIED,
+                verified_by=user,
+                verified_at=timezone.now(),
+            )
+            for tournament in tournaments.values():
+                if tournament.tournament_format in TiebreakEngine.FORMATS:
+                    TiebreakEngine.apply(tournament)
+                else:
+                    StandingsEngine.rerank(tournament)
+
+        for tournament in tournaments.values():
+            if tournament.auto_schedule:
+                MatchScheduler.schedule(tournament)
+        return {"verified": verified, "skipped": skipped}
@@ -1,13 +1,19 @@
+import json
+
 from rest_framework import viewsets, permissions, status
-from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.decorators import action
+from rest_framework.fields import BooleanField
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import F, Prefetch, Q
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
-from .models import Tournament, TournamentEntry, TournamentMatch, TournamentInvitation, PlayerTournamentRating, TournamentStanding, MatchScoreSubmission
+from .models import Tournament, TournamentFull, TournamentEntry, TournamentMatch, MatchParticipant, TournamentInvitation, PlayerTournamentRating, TournamentStanding, MatchScoreSubmission
 from .serializers import (
     TournamentListSerializer,
     TournamentDetailSerializer,
@@ -16,12 +22,37 @@ from .serializers import (
     TournamentMatchSerializer,
     TournamentInvitationSerializer,
     BatchEntrySerializer,
+    BulkInvitationSerializer,
     PlayerTournamentRatingSerializer,
+    LeaderboardEntrySerializer,
     TournamentStandingSerializer,
     MatchScoreSubmissionSerializer,
     ScoreSubmissionCreateSerializer,
+    HeatSerializer,
+    HeatResultSerializer,
+    BatchVerifySerializer,
+    TournamentSearchSerializer,
 )
+from .access import TournamentAccessIndex
+from .archive import TournamentArchiver
 from .bracket_generator import BracketGenerator
+from .bracket_tree import BracketTree
+from .caching import bump_leaderboard_version
+from .dashboard import OrganizerDashboard
+from .entry_import import EntryImporter
+from .event_feed import MatchEventFeed
+from .free_for_all import FreeForAllEngine
+from .invitations import InvitationService
+from .ladder import LadderEngine
+from .leaderboard import Leaderboard
+from .list_cache import TournamentListCache
+from .live import EventStreamRenderer, LiveScoreboard
+from .predictor import BracketPredictor
+from .scheduler import MatchScheduler
+from .search import TournamentSearch
+from .standings import StandingsEngine
+from .tiebreaks import TiebreakEngine
+from .verification import SubmissionVerifier
 
 
 class IsOrganizerOrReadOnly(permissions.BasePermission):
@@ -44,10 +75,30 @@ class TournamentViewSet(viewsets.ModelViewSet):
             return TournamentCreateSerializer
         return TournamentDetailSerializer
     
+    # Most-hit anonymous endpoints (home screen), served from TournamentListCache
+    LIST_ACTIONS = ['list', 'featured', 'upcoming', 'in_progress', 'completed']
+    
     def get_queryset(self):
         """Filter private tournaments unless user is organizer or participant"""
-        queryset = super().get_queryset()
-        # Handle status filtering from query params
+        queryset = self._filter_status(super().get_queryset())
+        
+        # For list actions, filter out private tournaments unless user has access.
+        if self.action in [*self.LIST_ACTIONS, 'search']:
+            user = self._request_user()
+            if user is not None:
+                # Public tournaments + private ones the user organizes, entered or was invited to
+                queryset = queryset.filter(pk__in=TournamentAccessIndex.visible(user))
+            else:
+                # Anonymous users see only public tournaments
+                queryset = queryset.filter(is_private=False)
+            
+            # List serializers read organizer.email and the denormalized confirmed_count only
+            queryset = queryset.select_related("organizer")
+        
+        return queryset
+    
+    def _filter_status(self, queryset):
+        """Handle status filtering from query params"""
         status_param = self.request.query_params.get('status')
         if status_param:
             status_map = {
@@ -64,34 +115,57 @@ class TournamentViewSet(viewsets.ModelViewSet):
                     start_time__gt=now,
                     status__in=[Tournament.Status.REGISTRATION_OPEN, Tournament.Status.REGISTRATION_CLOSED]
                 )
-        
-        # For list/upcoming/featured, filter out private tournaments unless user has access.
-        # Be tolerant of invalid/expired auth headers: treat as anonymous instead of 401.
-        if self.action in ['list', 'upcoming', 'featured']:
-            try:
-                user = self.request.user  # may trigger auth
-                is_auth = bool(getattr(user, "is_authenticated", False))
-            except Exception:
-                # Authentication failed (e.g., invalid token) — proceed as anonymous
-                user = None
-                is_auth = False
-
-            if is_auth:
-                # Show public tournaments + user's own tournaments (organized or participating)
-                user_tournament_ids = TournamentEntry.objects.filter(
-                    player=user
-                ).values_list('tournament_id', flat=True)
-
-                queryset = queryset.filter(
-                    Q(is_private=False) |
-                    Q(organizer=user) |
-                    Q(id__in=user_tournament_ids)
-                )
-            else:
-                # Anonymous users see only public tournaments
-                queryset = queryset.filter(is_private=False)
-        
         return queryset
+    
+    def _request_user(self):
+        """Authenticated user or ``None``.
+        
+        Be tolerant of invalid/expired auth headers: treat as anonymous instead of 401.
+        """
+        try:
+            user = self.request.user  # may trigger auth
+        except Exception:
+            return None
+        return user if getattr(user, "is_authenticated", False) else None
+    
+    def _public_queryset(self):
+        """What an anonymous visitor sees; the only rows that go into shared cached responses"""
+        return self._filter_status(Tournament.objects.filter(is_private=False)).select_related("organizer")
+    
+    def _cached_list(self, select, order="-start_time", limit=None):
+        """Serve a non-paginated list action from the shared response cache.
+        
+        ``select(queryset)`` applies the action's filters; ``order`` and
+        ``limit`` are its ordering and slice, so the user's private
+        tournaments can be merged into the cached public rows in Python.
+        """
+        def build(queryset):
+            queryset = select(queryset).order_by(order)
+            return TournamentListSerializer(queryset[:limit] if limit else queryset, many=True).data
+        
+        public = TournamentListCache.get_or_build(self.action, self.request.query_params, lambda: build(self._public_queryset()))
+        user = self._request_user()
+        private_ids = TournamentListCache.private_ids(user) if user else []
+        if not private_ids:
+            return Response(public)
+        
+        private = build(self._filter_status(Tournament.objects.filter(pk__in=private_ids)).select_related("organizer"))
+        field = order.lstrip("-")
+        merged = sorted(
+            [*public, *private],
+            key=lambda row: (parse_datetime(row[field]), row["id"]),
+            reverse=order.startswith("-"),
+        )
+        return Response(merged[:limit] if limit else merged)
+    
+    def list(self, request, *args, **kwargs):
+        """Paginated public list is shared; users with private tournaments get their own page"""
+        user = self._request_user()
+        if user is not None and TournamentListCache.private_ids(user):
+            return super().list(request, *args, **kwargs)
+        return Response(TournamentListCache.get_or_build(
+            self.action, request.query_params, lambda: super(TournamentViewSet, self).list(request, *args, **kwargs).data
+        ))
 
     def perform_authentication(self, request):
         """Attempt auth, but don't fail safe methods on bad/expired tokens."""
@@ -103,11 +177,27 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 return None
         return super().perform_authentication(request)
     
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Errors from the ``live`` stream are JSON, not an event-stream body"""
+        if isinstance(response, Response) and response.status_code >= 400 and isinstance(
+            getattr(request, "accepted_renderer", None), EventStreamRenderer
+        ):
+            request.accepted_renderer, request.accepted_media_type = JSONRenderer(), JSONRenderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
+    
     def get_permissions(self):
         if self.action in ["create", "update", "partial_update", "destroy"]:
             return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
     
+    def retrieve(self, request, *args, **kwargs):
+        """Completed tournaments are served from their archived document"""
+        tournament = self.get_object()
+        archived = TournamentArchiver.load(tournament)
+        if archived is not None:
+            return Response(TournamentArchiver.detail(archived, request))
+        return Response(self.get_serializer(tournament).data)
+    
     def perform_create(self, serializer):
         """Create tournament with current user as organizer"""
         serializer.save(organizer=self.request.user)
@@ -163,14 +253,23 @@ class TournamentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
         
-        # Create entry
-        entry_status = TournamentEntry.Status.PENDING if tournament.require_approval else TournamentEntry.Status.CONFIRMED
+        # Create entry; a confirmed entry claims its seat in the same transaction
+        if tournament.require_approval:
+            defaults = {"status": TournamentEntry.Status.PENDING}
+        else:
+            defaults = {"status": TournamentEntry.Status.CONFIRMED, "approved_at": timezone.now()}
         
-        entry, created = TournamentEntry.objects.get_or_create(
-            tournament=tournament,
-            player=request.user,
-            defaults={"status": entry_status}
-        )
+        try:
+            entry, created = TournamentEntry.objects.get_or_create(
+                tournament=tournament,
+                player=request.user,
+                defaults=defaults
+            )
+        except TournamentFull:
+            return Response(
+                {"error": "Tournament is full"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         if not created:
             return Response(
@@ -178,10 +277,6 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if entry.status == TournamentEntry.Status.CONFIRMED:
-            entry.approved_at = timezone.now()
-            entry.save()
-        
         serializer = TournamentEntrySerializer(entry)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
@@ -224,43 +319,61 @@ class TournamentViewSet(viewsets.ModelViewSet):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        player_ids = serializer.validated_data["player_ids"]
-        auto_approve = serializer.validated_data["auto_approve"]
-        
-        added = []
-        errors = []
-        
-        with transaction.atomic():
-            for player_id in player_ids:
-                try:
-                    from accounts.models import User
-                    player = User.objects.get(id=player_id)
-                    
-                    entry_status = TournamentEntry.Status.CONFIRMED if auto_approve else TournamentEntry.Status.PENDING
-                    
-                    entry, created = TournamentEntry.objects.get_or_create(
-                        tournament=tournament,
-                        player=player,
-                        defaults={"status": entry_status}
-                    )
-                    
-                    if created:
-                        if entry_status == TournamentEntry.Status.CONFIRMED:
-                            entry.approved_at = timezone.now()
-                            entry.save()
-                        added.append(player.email)
-                    else:
-                        errors.append(f"{player.email} already registered")
-                
-                except User.DoesNotExist:
-                    errors.append(f"Player ID {player_id} not found")
+        result = EntryImporter.import_players(
+            tournament,
+            player_ids=serializer.validated_data["player_ids"],
+            emails=serializer.validated_data["emails"],
+            auto_approve=serializer.validated_data["auto_approve"],
+        )
+        email_of = result["email_of"]
+        added = [email_of[player_id] for player_id in result["added"]]
+        errors = (
+            [f"{email_of[player_id]} already registered" for player_id in result["duplicates"]]
+            + [f"Player {key} not found" for key in result["missing"]]
+            + [f"{email_of[player_id]} not added: tournament is full" for player_id in result["over_capacity"]]
+        )
         
         return Response({
             "added": added,
             "errors": errors,
-            "total_added": len(added)
+            "total_added": len(added),
+            "added_ids": result["added"],
+            "duplicate_ids": result["duplicates"],
+            "missing": result["missing"],
+            "over_capacity_ids": result["over_capacity"],
         })
     
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def invite(self, request, pk=None):
+        """Bulk invite players to tournament (organizers only)"""
+        tournament = self.get_object()
+        
+        if tournament.organizer != request.user and not request.user.is_staff:
+            return Response(
+                {"error": "Only tournament organizer can invite players"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = BulkInvitationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = InvitationService.invite(
+            tournament,
+            request.user,
+            player_ids=serializer.validated_data["player_ids"],
+            emails=serializer.validated_data["emails"],
+            message=serializer.validated_data["message"],
+            expires_at=serializer.validated_data.get("expires_at"),
+        )
+        return Response({
+            "total_invited": len(result["invited"]),
+            "invited_ids": result["invited"],
+            "duplicate_ids": result["duplicates"],
+            "missing": result["missing"],
+            "expires_at": result["expires_at"],
+        }, status=status.HTTP_201_CREATED if result["invited"] else status.HTTP_200_OK)
+    
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def approve_entry(self, request, pk=None):
         """Approve pending entry (organizers only)"""
@@ -289,7 +402,13 @@ class TournamentViewSet(viewsets.ModelViewSet):
         
         entry.status = TournamentEntry.Status.CONFIRMED
         entry.approved_at = timezone.now()
-        entry.save()
+        try:
+            entry.save()
+        except TournamentFull:
+            return Response(
+                {"error": "Tournament is full"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         return Response(TournamentEntrySerializer(entry).data)
 
@@ -317,6 +436,37 @@ class TournamentViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def schedule(self, request, pk=None):
+        """Assign boards and start times to all open matches (organizer only)"""
+        tournament = self.get_object()
+        if tournament.organizer != request.user and not request.user.is_staff:
+            return Response({"error": "Only organizer can schedule matches"}, status=status.HTTP_403_FORBIDDEN)
+
+        for field in ["num_boards", "match_duration_minutes", "min_rest_minutes"]:
+            if field in request.data:
+                try:
+                    value = int(request.data[field])
+                except (TypeError, ValueError):
+                    return Response({"error": f"{field} must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+                if value < (0 if field == "min_rest_minutes" else 1):
+                    return Response({"error": f"{field} is out of range"}, status=status.HTTP_400_BAD_REQUEST)
+                setattr(tournament, field, value)
+        if "auto_schedule" in request.data:
+            # Opt in (or out) of re-planning on every result; a one-off schedule leaves it as is
+            try:
+                tournament.auto_schedule = BooleanField().to_internal_value(request.data["auto_schedule"])
+            except ValidationError:
+                return Response({"error": "auto_schedule must be a boolean"}, status=status.HTTP_400_BAD_REQUEST)
+        tournament.save()
+
+        summary = MatchScheduler.schedule(tournament)
+        return Response({
+            "message": "Matches scheduled",
+            **summary,
+            "estimated_duration_hours": tournament.estimated_duration_hours,
+        })
+
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def override_result(self, request, pk=None):
         """Override a match result (organizer only)"""
@@ -339,9 +489,11 @@ class TournamentViewSet(viewsets.ModelViewSet):
             match.winner_entry = match.player2_entry
         else:
             return Response({"error": "Scores cannot be tied"}, status=status.HTTP_400_BAD_REQUEST)
-        match.status = TournamentMatch.Status.COMPLETED
-        match.completed_at = timezone.now()
-        match.save()
+        if match.winner_entry is None:
+            return Response({"error": "The winning slot has no player"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # advance_winner saves the result after reading the stored one, so counters are corrected, not doubled
+        BracketGenerator.advance_winner(match, match.winner_entry)
 
         # live event
         try:
@@ -349,16 +501,16 @@ class TournamentViewSet(viewsets.ModelViewSet):
             MatchEvent.objects.create(
                 match=match,
                 event_type=MatchEvent.Type.RESULT_OVERRIDE,
-                payload={"p1": match.player1_score, "p2": match.player2_score, "winner": match.winner_entry.entry_id if match.winner_entry else None}
+                payload={"p1": match.player1_score, "p2": match.player2_score, "winner": match.winner_entry_id}
             )
         except Exception:
             pass
 
-        # advance and update standings
-        if match.winner_entry:
-            BracketGenerator.advance_winner(match, match.winner_entry)
+        # update standings
         if tournament.tournament_format in [Tournament.Format.SWISS, Tournament.Format.ROUND_ROBIN]:
             BracketGenerator.update_swiss_standings(tournament)
+        # Completed tournaments are read from their archive; refresh it with the corrected result
+        TournamentArchiver.refresh(tournament)
 
         return Response(TournamentMatchSerializer(match).data)
 
@@ -366,18 +518,39 @@ class TournamentViewSet(viewsets.ModelViewSet):
     def live_matches(self, request, pk=None):
         """List in-progress matches for live scores"""
         tournament = self.get_object()
-        qs = TournamentMatch.objects.filter(tournament=tournament, status=TournamentMatch.Status.IN_PROGRESS)
+        qs = TournamentMatch.objects.filter(tournament=tournament, status=TournamentMatch.Status.IN_PROGRESS).select_related(
+            "round", "player1_entry__player", "player2_entry__player", "winner_entry__player"
+        )
         return Response(TournamentMatchSerializer(qs, many=True).data)
 
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny], renderer_classes=[EventStreamRenderer, JSONRenderer])
+    def live(self, request, pk=None):
+        """Server-sent event stream of every match's score, status and advancement"""
+        tournament = self.get_object()
+        response = StreamingHttpResponse(LiveScoreboard.stream(tournament), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # Keep nginx from buffering the stream
+        return response
+
     @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
     def match_events(self, request, pk=None):
-        """Get event feed for a match"""
-        from .models import MatchEvent
+        """Get event feed for a match.
+        
+        ``since_id`` returns only events after that id; ``wait`` (seconds, up
+        to ``MatchEventFeed.MAX_WAIT``) holds the request open until a new
+        event arrives.
+        """
         match_id = request.query_params.get("match_id")
         match = get_object_or_404(TournamentMatch, id=match_id, tournament=self.get_object())
-        events = match.events.all()
-        data = [{"type": e.event_type, "payload": e.payload, "at": e.created_at.isoformat()} for e in events]
-        return Response(data)
+        try:
+            since_id = int(request.query_params.get("since_id", 0))
+            wait = float(request.query_params.get("wait", 0))
+        except ValueError:
+            return Response({"error": "since_id and wait must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if wait > 0:
+            return Response(MatchEventFeed.wait(match.pk, since_id, wait))
+        return Response(MatchEventFeed.fetch(match.pk, since_id))
     
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def start_tournament(self, request, pk=None):
@@ -413,6 +586,10 @@ class TournamentViewSet(viewsets.ModelViewSet):
             success = BracketGenerator.generate_round_robin(tournament)
         elif tournament.tournament_format == Tournament.Format.SWISS:
             success = BracketGenerator.generate_swiss_system(tournament)
+        elif tournament.tournament_format == Tournament.Format.LADDER:
+            success = LadderEngine.initialize(tournament)
+        elif tournament.tournament_format == Tournament.Format.FREE_FOR_ALL:
+            success = FreeForAllEngine.generate_round(tournament, 1)
         else:
             return Response(
                 {"error": f"Bracket generation not yet implemented for {tournament.get_tournament_format_display()}"},
@@ -424,6 +601,9 @@ class TournamentViewSet(viewsets.ModelViewSet):
             tournament.current_round = 1
             tournament.save()
             
+            if tournament.auto_schedule:
+                MatchScheduler.schedule(tournament)
+            
             return Response({
                 "message": "Tournament started successfully",
                 "bracket_generated": True
@@ -434,49 +614,185 @@ class TournamentViewSet(viewsets.ModelViewSet):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def bracket(self, request, pk=None):
+        """Compact bracket tree, cached until any match or entry changes"""
+        tournament = self.get_object()
+        archived = TournamentArchiver.load(tournament)
+        if archived is not None:
+            body = json.dumps(archived["bracket"], separators=(",", ":")).encode()
+            etag = f'"{tournament.pk}-archived-{archived["archived_at"]}"'
+        else:
+            body, version = BracketTree.render(tournament)
+            etag = f'"{tournament.pk}-{version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return HttpResponse(body, content_type="application/json", headers={"ETag": etag})
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def predictions(self, request, pk=None):
+        """Simulated chance of each entry reaching every round and winning"""
+        tournament = self.get_object()
+        try:
+            return Response(BracketPredictor.predict(tournament))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def ladder(self, request, pk=None):
+        """Get ladder entries ordered by position"""
+        tournament = self.get_object()
+        entries = tournament.entries.filter(
+            status=TournamentEntry.Status.CONFIRMED,
+            ladder_position__isnull=False
+        ).select_related("player").order_by("ladder_position")
+        return Response(TournamentEntrySerializer(entries, many=True).data)
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def ladder_targets(self, request, pk=None):
+        """List the entries the current user may challenge"""
+        tournament = self.get_object()
+        entry = get_object_or_404(TournamentEntry, tournament=tournament, player=request.user)
+        targets = LadderEngine.challengeable_entries(tournament, entry)
+        return Response(TournamentEntrySerializer(targets, many=True).data)
+
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def challenge(self, request, pk=None):
+        """Challenge a player higher up the ladder"""
+        tournament = self.get_object()
+        if tournament.tournament_format != Tournament.Format.LADDER or tournament.status != Tournament.Status.IN_PROGRESS:
+            return Response({"error": "Ladder is not running"}, status=status.HTTP_400_BAD_REQUEST)
+
+        challenger = get_object_or_404(
+            TournamentEntry, tournament=tournament, player=request.user, status=TournamentEntry.Status.CONFIRMED
+        )
+        defender = get_object_or_404(
+            TournamentEntry, id=request.data.get("entry_id"), tournament=tournament, status=TournamentEntry.Status.CONFIRMED
+        )
+        try:
+            match = LadderEngine.create_challenge(tournament, challenger, defender)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(TournamentMatchSerializer(match).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def heats(self, request, pk=None):
+        """List free-for-all heats (optionally for one round) with participants"""
+        tournament = self.get_object()
+        heats = TournamentMatch.objects.filter(tournament=tournament).select_related("round").prefetch_related(
+            Prefetch("participants", queryset=MatchParticipant.objects.select_related("entry__player"))
+        )
+        round_number = request.query_params.get("round")
+        if round_number:
+            heats = heats.filter(round__round_number=round_number)
+        return Response(HeatSerializer(heats, many=True).data)
+
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def submit_heat_result(self, request, pk=None):
+        """Record placements for a free-for-all heat (organizer only)"""
+        tournament = self.get_object()
+        if tournament.organizer != request.user and not request.user.is_staff:
+            return Response({"error": "Only organizer can submit heat results"}, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = HeatResultSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        match = get_object_or_404(TournamentMatch, id=serializer.validated_data["match_id"], tournament=tournament)
+        try:
+            round_complete = FreeForAllEngine.record_heat_result(match, serializer.validated_data["results"])
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"message": "Heat result recorded", "round_complete": round_complete})
+
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def next_heat_round(self, request, pk=None):
+        """Draw the next free-for-all round from current standings (organizer only)"""
+        tournament = self.get_object()
+        if tournament.organizer != request.user and not request.user.is_staff:
+            return Response({"error": "Only organizer can start the next round"}, status=status.HTTP_403_FORBIDDEN)
+
+        if tournament.tournament_format != Tournament.Format.FREE_FOR_ALL or tournament.status != Tournament.Status.IN_PROGRESS:
+            return Response({"error": "Tournament is not a running free-for-all"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if tournament.matches.filter(round__round_number=tournament.current_round).exclude(
+            status__in=[TournamentMatch.Status.COMPLETED, TournamentMatch.Status.WALKOVER, TournamentMatch.Status.CANCELLED]
+        ).exists():
+            return Response({"error": "Current round is not finished"}, status=status.HTTP_400_BAD_REQUEST)
+
+        FreeForAllEngine.generate_round(tournament, tournament.current_round + 1)
+        tournament.current_round += 1
+        tournament.save()
+        return Response({"message": "Next round drawn", "current_round": tournament.current_round})
+
     @action(detail=False, methods=["get"])
     def featured(self, request):
         """Get featured tournaments"""
-        tournaments = self.get_queryset().filter(is_featured=True, status__in=[
-            Tournament.Status.REGISTRATION_OPEN,
-            Tournament.Status.REGISTRATION_CLOSED,
-            Tournament.Status.IN_PROGRESS
-        ])[:10]
-        
-        serializer = TournamentListSerializer(tournaments, many=True)
-        return Response(serializer.data)
+        return self._cached_list(
+            lambda tournaments: tournaments.filter(is_featured=True, status__in=[
+                Tournament.Status.REGISTRATION_OPEN,
+                Tournament.Status.REGISTRATION_CLOSED,
+                Tournament.Status.IN_PROGRESS
+            ]),
+            limit=10,
+        )
+    
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Ranked full-text search over name, description and organizer, keyset paginated"""
+        params = TournamentSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        
+        queryset = self.get_queryset()
+        if "tournament_format" in data:
+            queryset = queryset.filter(tournament_format=data["tournament_format"])
+        if "game_mode" in data:
+            queryset = queryset.filter(game_mode=data["game_mode"])
+        if "start_after" in data:
+            queryset = queryset.filter(start_time__gte=data["start_after"])
+        if "start_before" in data:
+            queryset = queryset.filter(start_time__lt=data["start_before"])
+        if "min_spots" in data:
+            queryset = queryset.filter(max_participants__gte=F("confirmed_count") + data["min_spots"])
+        
+        ranked = TournamentSearch.match(queryset, TournamentSearch.terms(data.get("q")))
+        rows, next_cursor = TournamentSearch.page(ranked, data["limit"], data.get("cursor"))
+        results = TournamentListSerializer(rows, many=True).data
+        for row, tournament in zip(results, rows):
+            row["rank"] = tournament.rank
+        return Response({"results": results, "next": next_cursor})
     
     @action(detail=False, methods=["get"])
     def upcoming(self, request):
         """Get upcoming tournaments"""
         now = timezone.now()
-        tournaments = self.get_queryset().filter(
-            start_time__gt=now,
-            status__in=[Tournament.Status.REGISTRATION_OPEN, Tournament.Status.REGISTRATION_CLOSED]
-        ).order_by("start_time")[:20]
-        
-        serializer = TournamentListSerializer(tournaments, many=True)
-        return Response(serializer.data)
+        return self._cached_list(
+            lambda tournaments: tournaments.filter(
+                start_time__gt=now,
+                status__in=[Tournament.Status.REGISTRATION_OPEN, Tournament.Status.REGISTRATION_CLOSED]
+            ),
+            order="start_time",
+            limit=20,
+        )
     
     @action(detail=False, methods=["get"])
     def in_progress(self, request):
         """Get tournaments currently in progress"""
-        tournaments = self.get_queryset().filter(
-            status=Tournament.Status.IN_PROGRESS
-        ).order_by("-start_time")[:20]
-        
-        serializer = TournamentListSerializer(tournaments, many=True)
-        return Response(serializer.data)
+        return self._cached_list(
+            lambda tournaments: tournaments.filter(status=Tournament.Status.IN_PROGRESS),
+            limit=20,
+        )
     
     @action(detail=False, methods=["get"])
     def completed(self, request):
         """Get completed tournaments"""
-        tournaments = self.get_queryset().filter(
-            status=Tournament.Status.COMPLETED
-        ).order_by("-start_time")[:50]
-        
-        serializer = TournamentListSerializer(tournaments, many=True)
-        return Response(serializer.data)
+        return self._cached_list(
+            lambda tournaments: tournaments.filter(status=Tournament.Status.COMPLETED),
+            limit=50,
+        )
     
     @action(detail=False, methods=["get"])
     def my_tournaments(self, request):
@@ -486,7 +802,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
         
         entries = TournamentEntry.objects.filter(player=request.user).select_related("tournament")
         tournament_ids = entries.values_list("tournament_id", flat=True)
-        tournaments = Tournament.objects.filter(id__in=tournament_ids)
+        tournaments = Tournament.objects.filter(id__in=tournament_ids).select_related("organizer")
         
         serializer = TournamentListSerializer(tournaments, many=True)
         return Response(serializer.data)
@@ -528,6 +844,9 @@ class TournamentViewSet(viewsets.ModelViewSet):
     def standings(self, request, pk=None):
         """Get tournament standings/leaderboard"""
         tournament = self.get_object()
+        archived = TournamentArchiver.load(tournament)
+        if archived is not None:
+            return Response(archived["standings"])
         standings = TournamentStanding.objects.filter(tournament=tournament).select_related("entry__player")
         
         serializer = TournamentStandingSerializer(standings, many=True)
@@ -618,6 +937,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
             
             # Update standings
             self._update_standings(tournament, match, winner)
+            TournamentArchiver.refresh(tournament)
         
         return Response({
             "message": "Score submitted successfully",
@@ -628,57 +948,12 @@ class TournamentViewSet(viewsets.ModelViewSet):
     
     def _update_standings(self, tournament, match, winner):
         """Update tournament standings after match completion"""
-        from django.db.models import F
-        
-        # Update or create standings for both players
-        if match.player1_entry:
-            standing, _ = TournamentStanding.objects.get_or_create(
-                tournament=tournament,
-                entry=match.player1_entry
-            )
-            standing.matches_played = F("matches_played") + 1
-            standing.points_for = F("points_for") + (match.player1_score or 0)
-            standing.points_against = F("points_against") + (match.player2_score or 0)
-            
-            if winner == match.player1_entry:
-                standing.matches_won = F("matches_won") + 1
-                standing.tournament_points = F("tournament_points") + 3  # 3 points for win
-            else:
-                standing.matches_lost = F("matches_lost") + 1
-            
-            standing.save()
-            standing.refresh_from_db()
-            standing.update_statistics()
-            standing.save()
-        
-        if match.player2_entry:
-            standing, _ = TournamentStanding.objects.get_or_create(
-                tournament=tournament,
-                entry=match.player2_entry
-            )
-            standing.matches_played = F("matches_played") + 1
-            standing.points_for = F("points_for") + (match.player2_score or 0)
-            standing.points_against = F("points_against") + (match.player1_score or 0)
-            
-            if winner == match.player2_entry:
-                standing.matches_won = F("matches_won") + 1
-                standing.tournament_points = F("tournament_points") + 3
-            else:
-                standing.matches_lost = F("matches_lost") + 1
-            
-            standing.save()
-            standing.refresh_from_db()
-            standing.update_statistics()
-            standing.save()
-        
-        # Update rankings
-        standings = TournamentStanding.objects.filter(tournament=tournament).order_by(
-            "-tournament_points", "-points_difference", "-points_for"
-        )
-        
-        for rank, standing in enumerate(standings, start=1):
-            standing.rank = rank
-            standing.save()
+        if tournament.tournament_format in TiebreakEngine.FORMATS:
+            TiebreakEngine.apply(tournament)
+            return
+        with transaction.atomic():
+            StandingsEngine.record_result(tournament, match, winner)
+            StandingsEngine.rerank(tournament)
 
 
 class TournamentMatchViewSet(viewsets.ReadOnlyModelViewSet):
@@ -715,6 +990,7 @@ class TournamentMatchViewSet(viewsets.ReadOnlyModelViewSet):
         match.player2_score = player2_score
         
         BracketGenerator.advance_winner(match, winner_entry)
+        TournamentArchiver.refresh(match.tournament)
         
         return Response(TournamentMatchSerializer(match).data)
 
@@ -727,20 +1003,48 @@ class PlayerTournamentRatingViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=False, methods=["get"])
     def leaderboard(self, request):
-        """Get global tournament leaderboard"""
-        limit = int(request.query_params.get("limit", 100))
-        ratings = PlayerTournamentRating.objects.all()[:limit]
-        
-        serializer = self.get_serializer(ratings, many=True)
-        return Response(serializer.data)
+        """Get global tournament leaderboard (``limit`` up to 200, optional ``tier``)"""
+        try:
+            limit = int(request.query_params.get("limit", Leaderboard.DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        tier = request.query_params.get("tier")
+        if tier and tier not in Leaderboard.TIERS:
+            return Response({"error": f"tier must be one of {', '.join(Leaderboard.TIERS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(Leaderboard.top(limit, tier))
     
     @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
     def my_rating(self, request):
         """Get current user's rating"""
         rating, created = PlayerTournamentRating.objects.get_or_create(player=request.user)
+        if created:
+            bump_leaderboard_version()
         
         serializer = self.get_serializer(rating)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def around_me(self, request):
+        """Current user's rank and the players within ``k`` ranks (optional ``tier``)"""
+        try:
+            k = int(request.query_params.get("k", 5))
+        except ValueError:
+            return Response({"error": "k must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        tier = request.query_params.get("tier")
+        if tier and tier not in Leaderboard.TIERS:
+            return Response({"error": f"tier must be one of {', '.join(Leaderboard.TIERS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        rating = PlayerTournamentRating.objects.filter(player=request.user).values_list("rating", flat=True).first()
+        if rating is None:
+            return Response({"error": "You have no tournament rating yet"}, status=status.HTTP_404_NOT_FOUND)
+        
+        rank, window = Leaderboard.around(rating, k, tier)
+        return Response({
+            "rank": rank,
+            "rating": rating,
+            "results": LeaderboardEntrySerializer(window, many=True).data,
+        })
 
 
 class MatchScoreSubmissionViewSet(viewsets.ModelViewSet):
@@ -753,17 +1057,22 @@ class MatchScoreSubmissionViewSet(viewsets.ModelViewSet):
         """Filter submissions based on user role"""
         user = self.request.user
         
-        # Organizers see all submissions for their tournaments
-        organized_tournaments = Tournament.objects.filter(organizer=user)
-        organizer_submissions = MatchScoreSubmission.objects.filter(
-            match__tournament__in=organized_tournaments
-        )
-        
-        # Users see their own submissions
-        own_submissions = MatchScoreSubmission.objects.filter(submitted_by=user)
-        
-        # Combine both querysets
-        return (organizer_submissions | own_submissions).distinct()
+        # Organizers see all submissions for their tournaments, users see their own.
+        # Both sides follow single-valued relations, so the OR cannot duplicate rows.
+        return MatchScoreSubmission.objects.filter(
+            Q(match__tournament__organizer=user) | Q(submitted_by=user)
+        ).select_related(*OrganizerDashboard.SUBMISSION_RELATED)
+    
+    @action(detail=False, methods=["get"])
+    def dashboard(self, request):
+        """Pending work counters for every tournament the user organizes"""
+        return Response(OrganizerDashboard.summary(request.user))
+    
+    @action(detail=False, methods=["get"])
+    def review_queue(self, request):
+        """Paginated pending and disputed submissions across the user's tournaments"""
+        page = self.paginate_queryset(OrganizerDashboard.review_queue(request.user))
+        return self.get_paginated_response(MatchScoreSubmissionSerializer(page, many=True).data)
     
     @action(detail=True, methods=["post"])
     def verify(self, request, pk=None):
@@ -790,12 +1099,44 @@ class MatchScoreSubmissionViewSet(viewsets.ModelViewSet):
         submission.verified_by = request.user
         submission.verified_at = timezone.now()
         submission.save()
+        TournamentArchiver.refresh(tournament)
         
         return Response({
             "message": "Score verified and applied",
             "submission": MatchScoreSubmissionSerializer(submission).data
         })
     
+    @action(detail=False, methods=["post"])
+    def verify_batch(self, request):
+        """Verify many submissions in one transaction (organizer only)"""
+        serializer = BatchVerifySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        requested = data.get("submission_ids")
+        if requested:
+            queryset = MatchScoreSubmission.objects.filter(pk__in=requested)
+        else:
+            queryset = MatchScoreSubmission.objects.filter(
+                match__tournament_id=data["tournament"],
+                match__round__round_number=data["round"],
+                match__round__is_losers_bracket=False,
+            )
+        submissions = list(SubmissionVerifier.pending(queryset))
+        
+        if any(s.match.tournament.organizer_id != request.user.pk for s in submissions):
+            return Response(
+                {"error": "Only tournament organizer can verify scores"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        result = SubmissionVerifier.verify(submissions, request.user)
+        if requested:
+            found = {s.pk for s in submissions}
+            result["not_pending"] = [pk for pk in dict.fromkeys(requested) if pk not in found]
+        result["total_verified"] = len(result["verified"])
+        return Response(result)
+    
     @action(detail=True, methods=["post"])
     def dispute(self, request, pk=None):
         """Dispute a score submission"""